@@ -1,4 +1,4 @@
-from abilities.ability import Ability
+from abilities.ability import Ability, ABILITY_HOOKS
 from abilities.healing_ability import HealingAbility
 from abilities.shield_ability import ShieldAbility
 from abilities.poison_ability import PoisonAbility
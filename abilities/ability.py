@@ -1,7 +1,15 @@
-import pygame
+from sprites import load_image
+
+# Events an ability can react to; Player keeps a dispatch table per hook
+ABILITY_HOOKS = ('on_tick', 'on_projectile_hit', 'on_player_hit', 'on_enemy_killed')
 
 class Ability:
-    """Base class for abilities."""
+    """Base class for abilities.
+
+    A subclass lists the ABILITY_HOOKS it implements in `hooks`; the player
+    only calls those, and only while the ability is active.
+    """
+    hooks = ()
     def __init__(self, name, description, cost, icon_path=None, images=None, active=False):
         self.name = name  # Ability name
         self.description = description  # Short description of what the ability does
@@ -14,15 +22,33 @@ class Ability:
         """Draw the ability icon dynamically."""
         if self.icon_path:
             try:
-                # Load and scale the icon
-                icon = pygame.image.load(self.icon_path)
-                icon = pygame.transform.scale(icon, (size, size))
+                # Shared, pre-scaled icon
+                icon = load_image(self.icon_path, (size, size))
                 screen.blit(icon, (x, y))
             except FileNotFoundError:
                 print(f"[DEBUG] Icon file not found for {self.name}: {self.icon_path}")
         else:
             print(f"[DEBUG] No icon path specified for {self.name}")
 
+    def equip(self, player):
+        """Called once when the player gets the ability, e.g. to start its timers."""
+
+    def unequip(self, player):
+        """Called when the player loses the ability, e.g. to stop its timers."""
+
+    def on_tick(self, player):
+        """Called once per game tick."""
+
+    def on_projectile_hit(self, player, enemy):
+        """Called when one of the player's projectiles hits `enemy`."""
+
+    def on_player_hit(self, player):
+        """Called when the player is about to take a hit. Return True to block it."""
+        return False
+
+    def on_enemy_killed(self, player, enemy):
+        """Called when `enemy` is defeated."""
+
     def activate(self):
         """Activate the ability."""
         self.active = True
@@ -1,8 +1,10 @@
-import time
 from abilities.ability import Ability
+from dot_engine import dot_engine
 
 class BurningAbility(Ability):
     """An ability that applies a burning effect, dealing damage over time."""
+    hooks = ('on_projectile_hit',)
+
     def __init__(self, name="Burning Touch",
                  description="Apply burning to enemies, dealing damage over time.",
                  cost=5,
@@ -17,27 +19,11 @@ class BurningAbility(Ability):
         self.burn_duration = self.base_burn_duration
 
     def apply_burn(self, enemy):
-        """Apply the burning effect to an enemy."""
-        current_time = time.time()
-        if not hasattr(enemy, "burn_end_time") or current_time > enemy.burn_end_time:
-            enemy.burn_end_time = current_time + self.burn_duration
-            enemy.next_burn_tick = current_time
-
-    def update_burn(self, enemy):
-        """Update the burning effect, dealing damage at regular intervals."""
-        current_time = time.time()
-        if hasattr(enemy, "burn_end_time") and current_time <= enemy.burn_end_time:
-            if current_time >= enemy.next_burn_tick:
-                enemy.take_damage(self.burn_damage)
-                enemy.next_burn_tick += self.burn_interval
+        """Apply the burning effect to an enemy; the damage is dealt by dot_engine."""
+        dot_engine.apply(enemy, "burn", self.burn_damage, self.burn_interval, self.burn_duration)
 
-                # Check if the enemy is dead
-                if enemy.hp <= 0:
-                    return True  # Indicate the enemy is dead
-        elif hasattr(enemy, "burn_end_time") and current_time > enemy.burn_end_time:
-            del enemy.burn_end_time
-            del enemy.next_burn_tick
-        return False
+    def on_projectile_hit(self, player, enemy):
+        self.apply_burn(enemy)
 
     def update_attributes(self, burn_damage_level, burn_duration_level):
         """Update the burn damage and duration based on skill levels."""
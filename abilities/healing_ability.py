@@ -1,7 +1,7 @@
 import pygame
-import time
 
 from abilities.ability import Ability
+from game_clock import game_clock
 
 class HealingAbility(Ability):
     """An ability that passively heals the player for 5 HP every 10 seconds."""
@@ -15,11 +15,39 @@ class HealingAbility(Ability):
         self.last_heal_time = 0  # Tracks the last time the ability healed
         self.heal_amount = 5  # Amount of HP healed
         self.cooldown = 10  # Cooldown time in seconds for healing
+        self.heal_timer = None  # Next heal, scheduled on the game clock
+
+    def equip(self, player):
+        """Heal `player` every `cooldown` seconds from now on."""
+        self.schedule_heal(player)
+
+    def schedule_heal(self, player):
+        """(Re)schedule the next heal `cooldown` seconds after the last one."""
+        if self.heal_timer is not None:
+            self.heal_timer.cancel()
+        delay = self.last_heal_time + self.cooldown - game_clock.time()
+        self.heal_timer = game_clock.schedule(delay, self.heal, player)
+
+    def unequip(self, player):
+        """Stop healing `player`."""
+        if self.heal_timer is not None:
+            self.heal_timer.cancel()
+            self.heal_timer = None
 
     def heal(self, player):
-        """Heal the player if the cooldown period has passed."""
-        current_time = time.time()
-        if self.active and (current_time - self.last_heal_time >= self.cooldown):
-            # Heal the player
+        """Heal the player, then wait for the cooldown again."""
+        if self not in player.abilities:
+            self.heal_timer = None  # Dropped without unequip(); stop rescheduling
+            return
+        if self.active:
             player.health = min(player.max_health, player.health + self.heal_amount)
-            self.last_heal_time = current_time  # Update the last heal time
+            self.last_heal_time = game_clock.time()  # Update the last heal time
+        self.heal_timer = None
+        self.schedule_heal(player)
+
+    def update_attributes(self, heal_level, player):
+        """Update the heal amount and cooldown based on the skill level."""
+        self.heal_amount = 5 + (2 * heal_level)
+        self.cooldown = max(10 - heal_level, 3)
+        if self.heal_timer is not None:
+            self.schedule_heal(player)  # The pending heal follows the new cooldown
@@ -3,6 +3,8 @@ from abilities.ability import Ability
 
 class InvincibilityAbility(Ability):
     """An ability that increases the invincibility duration after taking damage."""
+    hooks = ('on_tick',)
+
     def __init__(self, name="Invincibility Boost",
                  description="Increase invincibility duration after taking damage.",
                  cost=6,
@@ -22,3 +24,6 @@ class InvincibilityAbility(Ability):
                 player.invincibility_time, 
                 player.base_invincibility_time + additional_time
             )
+
+    def on_tick(self, player):
+        self.apply_invincibility(player)
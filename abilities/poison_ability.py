@@ -1,8 +1,10 @@
-import time
 from abilities.ability import Ability
+from dot_engine import dot_engine
 
 class PoisonAbility(Ability):
     """An ability that applies a poison effect, dealing damage over time."""
+    hooks = ('on_projectile_hit',)
+
     def __init__(self, name="Poison Touch",
                  description="Apply poison to enemies, dealing damage over time.",
                  cost=4,
@@ -17,27 +19,11 @@ class PoisonAbility(Ability):
         self.poison_duration = self.base_poison_duration
 
     def apply_poison(self, enemy):
-        """Apply the poison effect to an enemy."""
-        current_time = time.time()
-        if not hasattr(enemy, "poison_end_time") or current_time > enemy.poison_end_time:
-            enemy.poison_end_time = current_time + self.poison_duration
-            enemy.next_poison_tick = current_time
-
-    def update_poison(self, enemy):
-        """Update the poison effect, dealing damage at regular intervals."""
-        current_time = time.time()
-        if hasattr(enemy, "poison_end_time") and current_time <= enemy.poison_end_time:
-            if current_time >= enemy.next_poison_tick:
-                enemy.take_damage(self.poison_damage)
-                enemy.next_poison_tick += self.poison_interval
+        """Apply the poison effect to an enemy; the damage is dealt by dot_engine."""
+        dot_engine.apply(enemy, "poison", self.poison_damage, self.poison_interval, self.poison_duration)
 
-                # Check if the enemy is dead
-                if enemy.hp <= 0:
-                    return True  # Indicate the enemy is dead
-        elif hasattr(enemy, "poison_end_time") and current_time > enemy.poison_end_time:
-            del enemy.poison_end_time
-            del enemy.next_poison_tick
-        return False
+    def on_projectile_hit(self, player, enemy):
+        self.apply_poison(enemy)
 
     """
     def update_attributes(self, poison_damage_level, poison_duration_level):
@@ -1,9 +1,11 @@
 import pygame
-import time
 from abilities.ability import Ability
+from game_clock import game_clock
 
 class ShieldAbility(Ability):
     """An ability that blocks one incoming attack and resets after a cooldown."""
+    hooks = ('on_player_hit',)
+
     def __init__(self, name="Block Shield", 
                  description="Block one incoming attack and resets after 30 seconds.", 
                  cost=5, 
@@ -17,22 +19,17 @@ class ShieldAbility(Ability):
         self.last_block_time = None  # Tracks the last time the ability blocked an attack
 
     def block(self):
-        """Block one attack and deactivate the ability."""
+        """Block one attack and deactivate the ability until the cooldown resets it."""
         if self.active and self.ready:
             self.blocked = True
             self.ready = False
-            self.last_block_time = time.time()
+            self.last_block_time = game_clock.time()
+            game_clock.schedule(self.cooldown, self.reset_block)
             return True
         return False
 
-    def update(self):
-        """Check if the cooldown has passed and reset the block ability."""
-        if not self.ready:
-            current_time = time.time()
-            if self.last_block_time is not None:
-                elapsed_time = current_time - self.last_block_time
-                if elapsed_time >= self.cooldown:
-                    self.reset_block()
+    def on_player_hit(self, player):
+        return self.block()
 
     def reset_block(self):
         """Reset the block ability, allowing it to be used again."""
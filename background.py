@@ -0,0 +1,52 @@
+import pygame
+
+BACKGROUND_TILE_SIZE = 256  # Edge length of a background tile in pixels
+
+class TiledBackground:
+    """World background split into display-format tiles, of which only those under the camera are drawn."""
+    def __init__(self, image, tile_size=BACKGROUND_TILE_SIZE):
+        self.tile_size = tile_size
+        self.width, self.height = image.get_size()
+        self.columns = -(-self.width // tile_size)
+        self.rows = -(-self.height // tile_size)
+        # Only whole tiles repeat seamlessly when the image is wrapped
+        self.whole_columns = max(1, self.width // tile_size)
+        self.whole_rows = max(1, self.height // tile_size)
+        self.tiles = []  # Rows of tile surfaces
+
+        # The background is opaque, so tiles drop the per-pixel alpha when a display exists
+        convert = pygame.display.get_surface() is not None
+        shared = {}  # Tile pixels -> tile surface
+        for row in range(self.rows):
+            tile_row = []
+            for column in range(self.columns):
+                area = pygame.Rect(column * tile_size, row * tile_size, tile_size, tile_size).clip(image.get_rect())
+                tile = image.subsurface(area)
+                key = (area.size, pygame.image.tobytes(tile, 'RGBA'))
+                surface = shared.get(key)
+                if surface is None:
+                    surface = tile.convert() if convert else tile.copy()
+                    shared[key] = surface
+                tile_row.append(surface)
+            self.tiles.append(tile_row)
+        self.unique_tiles = len(shared)
+
+    def wrapped_tile(self, column, row):
+        """Tile at any grid position of an endless plane covered with copies of the image."""
+        return self.tiles[row % self.whole_rows][column % self.whole_columns]
+
+    def draw(self, screen, camera_x, camera_y):
+        """Blit the tiles that intersect the screen with the camera at (camera_x, camera_y)."""
+        size = self.tile_size
+        camera_x, camera_y = int(camera_x), int(camera_y)  # Whole pixels, so neighbouring tiles line up
+        screen_width, screen_height = screen.get_size()
+        first_column = max(0, camera_x // size)
+        first_row = max(0, camera_y // size)
+        last_column = min(self.columns - 1, (camera_x + screen_width - 1) // size)
+        last_row = min(self.rows - 1, (camera_y + screen_height - 1) // size)
+
+        screen.blits([
+            (self.tiles[row][column], (column * size - camera_x, row * size - camera_y))
+            for row in range(first_row, last_row + 1)
+            for column in range(first_column, last_column + 1)
+        ], doreturn=False)
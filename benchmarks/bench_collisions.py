@@ -0,0 +1,83 @@
+"""Scaling benchmark for EnemyManager.handle_projectile_collisions.
+
+Run from the repository root:
+
+    python benchmarks/bench_collisions.py
+
+The grid-based broad phase is timed against the previous all-pairs scan for
+growing enemy and projectile counts.
+"""
+import random
+import time
+
+import headless
+import pygame
+
+headless.init_display()
+
+from settings import MAP_WIDTH, MAP_HEIGHT
+from enemy_manager import EnemyManager
+from enemies import BatEnemy, SkeletonEnemy, BlobEnemy
+from player import Player
+from projectile import ProjectileStore, PLAYER_TEAM, NORMAL_SHOT, PLAYER_SHOT_SIZE
+
+ENEMY_COUNTS = [50, 100, 250, 500, 1000, 2000]
+PROJECTILE_COUNTS = [50, 300]
+REPEATS = 5
+
+def build_world(enemy_count, projectile_count, rng):
+    """Scatter enemies and projectiles uniformly over the map."""
+    enemy_manager = EnemyManager()
+    for _ in range(enemy_count):
+        enemy_type = rng.choice([BatEnemy, SkeletonEnemy, BlobEnemy])
+        enemy = enemy_type(rng.uniform(0, MAP_WIDTH), rng.uniform(0, MAP_HEIGHT))
+        enemy.hp = enemy.max_hp = float('inf')  # Keep the world stable between repeats
+        enemy_manager.add_enemy(enemy)
+
+    projectiles = ProjectileStore()
+    for _ in range(projectile_count):
+        projectiles.add(rng.uniform(0, MAP_WIDTH), rng.uniform(0, MAP_HEIGHT), 1, 0, 0, 0,
+                        PLAYER_TEAM, NORMAL_SHOT, *PLAYER_SHOT_SIZE)
+    return enemy_manager, projectiles
+
+def copy_store(projectiles):
+    """A ProjectileStore holding the same projectiles, so every repeat starts from the same world."""
+    copy = ProjectileStore(projectiles.capacity)
+    for name in ProjectileStore.FIELDS:
+        getattr(copy, name)[:] = getattr(projectiles, name)
+    copy.count = projectiles.count
+    return copy
+
+def all_pairs_collisions(enemy_manager, projectiles):
+    """Reference O(P x E) scan equivalent to the pre-grid implementation."""
+    for slot in range(projectiles.count):
+        projectile_rect = pygame.Rect(projectiles.x[slot], projectiles.y[slot], 10, 10)
+        for enemy in enemy_manager.enemies:
+            if projectile_rect.colliderect(enemy.get_rect()):
+                break
+
+def time_call(func):
+    """Return the best wall time of several runs in milliseconds."""
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    rng = random.Random(1234)
+    player = Player()
+    print(f"{'enemies':>8} {'projectiles':>12} {'all pairs (ms)':>15} {'grid (ms)':>10} {'speedup':>8}")
+    for projectile_count in PROJECTILE_COUNTS:
+        for enemy_count in ENEMY_COUNTS:
+            enemy_manager, projectiles = build_world(enemy_count, projectile_count, rng)
+
+            brute_ms = time_call(lambda: all_pairs_collisions(enemy_manager, projectiles))
+            grid_ms = time_call(lambda: enemy_manager.handle_projectile_collisions(
+                copy_store(projectiles), player, [], {}, lambda **kwargs: None
+            ))
+            print(f"{enemy_count:>8} {projectile_count:>12} {brute_ms:>15.3f} {grid_ms:>10.3f} {brute_ms / grid_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Scaling benchmark for the flow-field chase step.
+
+Run from the repository root:
+
+    python benchmarks/bench_flow_field.py
+
+Ground enemies are scattered over the arena among a growing number of
+obstacles. The chase step (EnemyStore.move_toward with the flow field) is
+timed per enemy, and should stay flat whatever the obstacle count; the
+rebuild the player triggers by entering another cell is timed on its own.
+"""
+import random
+import time
+
+import headless
+import pygame
+
+headless.init_display()
+
+from settings import MAP_WIDTH, MAP_HEIGHT
+from enemy_manager import EnemyManager
+from enemies import SkeletonEnemy, BlobEnemy
+from world import world
+from flow_field import FLOW_CELL_SIZE
+
+OBSTACLE_COUNTS = [0, 20, 80, 240]
+ENEMY_COUNTS = [250, 1000, 4000]
+REPEATS = 20
+PLAYER_X, PLAYER_Y = MAP_WIDTH // 2, MAP_HEIGHT // 2
+
+def place_obstacles(count, rng):
+    """Scatter `count` wall pieces over the arena, leaving the player's surroundings open."""
+    obstacles = []
+    while len(obstacles) < count:
+        rect = pygame.Rect(rng.uniform(0, MAP_WIDTH), rng.uniform(0, MAP_HEIGHT),
+                           rng.choice([64, 128, 192]), rng.choice([64, 128, 192]))
+        if not rect.inflate(256, 256).collidepoint(PLAYER_X, PLAYER_Y):
+            obstacles.append(rect)
+    world.set_obstacles(obstacles)
+
+def build_horde(enemy_count, rng):
+    """An EnemyManager with `enemy_count` ground enemies spread over the arena."""
+    enemy_manager = EnemyManager()
+    for _ in range(enemy_count):
+        enemy_type = rng.choice([SkeletonEnemy, BlobEnemy])
+        enemy_manager.add_enemy(enemy_type(rng.uniform(0, MAP_WIDTH), rng.uniform(0, MAP_HEIGHT)))
+    return enemy_manager
+
+def time_call(func):
+    """Return the best wall time of several runs in milliseconds."""
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    rng = random.Random(1234)
+    world.reset(False)
+    print(f"{'obstacles':>9} {'enemies':>8} {'detoured':>9} {'chase (ms)':>11} {'per enemy (us)':>15} {'rebuild (ms)':>13}")
+    for obstacle_count in OBSTACLE_COUNTS:
+        place_obstacles(obstacle_count, rng)
+        for enemy_count in ENEMY_COUNTS:
+            enemy_manager = build_horde(enemy_count, rng)
+            store = enemy_manager.store
+            field = enemy_manager.flow_field
+            field.update(PLAYER_X, PLAYER_Y)
+
+            # Enemies sitting in cells whose path bends around an obstacle
+            detoured = 0
+            if field.detours:
+                n = store.count
+                rows = ((store.y[:n] + store.height[:n] / 2) // FLOW_CELL_SIZE).astype(int) + 1
+                columns = ((store.x[:n] + store.width[:n] / 2) // FLOW_CELL_SIZE).astype(int) + 1
+                detoured = int((~field.straight[rows * field.stride + columns]).sum())
+
+            chase_ms = time_call(lambda: (field.update(PLAYER_X, PLAYER_Y),
+                                          store.move_toward(PLAYER_X, PLAYER_Y, field)))
+            rebuild_ms = time_call(field.rebuild) if field.detours else 0.0
+            print(f"{obstacle_count:>9} {enemy_count:>8} {detoured:>9} {chase_ms:>11.3f} "
+                  f"{chase_ms * 1000 / enemy_count:>15.3f} {rebuild_ms:>13.3f}")
+
+if __name__ == "__main__":
+    main()
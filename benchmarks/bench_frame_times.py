@@ -0,0 +1,291 @@
+"""Scenario-based frame-time benchmark for the game's hot loop.
+
+Run from the repository root:
+
+    python benchmarks/bench_frame_times.py
+    python benchmarks/bench_frame_times.py --output results.json
+    python benchmarks/bench_frame_times.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_frame_times.py --baseline benchmarks/baseline.json
+
+Every scenario builds a synthetic world directly through EnemyManager, the
+projectile store and xp_drops, then runs a number of frames, timing each phase
+of the frame separately. Results are printed as JSON (p50/p95/p99/mean in
+milliseconds per phase, plus 'frame' for the sum of the phases), and a line per
+scenario tells whether its p95 frame fits the 60 FPS budget. With --baseline each phase's p50 is compared to a
+stored run and the script exits with status 1 if any phase got slower than the
+tolerance allows. Baselines are machine specific, so record one on the machine
+that runs the comparison.
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+
+import headless
+import numpy
+import pygame
+
+screen = headless.init_display((1366, 768))
+
+import rng
+from settings import MAP_WIDTH, MAP_HEIGHT, CULL_MARGIN
+from enemy_manager import EnemyManager
+from enemies import BatEnemy, SkeletonEnemy, BlobEnemy, Boss1Enemy, Boss2Enemy
+from player import Player
+from projectile import (projectile_store, fire_projectile, move_projectiles, draw_projectiles,
+                        PLAYER_TEAM, ENEMY_TEAM, BOSS_SHOT)
+from bullet_patterns import Emitter
+from xp import xp_drops, draw_xp_drops, new_xp_drop
+from game_clock import game_clock
+
+PHASES = [
+    'update_enemies',
+    'timers',
+    'move_projectiles',
+    'handle_projectile_collisions',
+    'enemy_projectile_hits',
+    'handle_player_collisions',
+    'draw_enemies',
+    'draw_projectiles',
+    'draw_xp_drops',
+]
+
+# name -> world description
+SCENARIOS = {
+    'enemies_100': {'enemies': 100, 'projectiles': 50},
+    'enemies_500': {'enemies': 500, 'projectiles': 50},
+    'enemies_2000': {'enemies': 2000, 'projectiles': 50},
+    'projectiles_300': {'enemies': 500, 'projectiles': 300},
+    'boss2_wave': {'enemies': 100, 'projectiles': 50, 'boss2': True},
+    'xp_drops_1000': {'enemies': 100, 'projectiles': 50, 'xp_drops': 1000},
+    'boss_bullets_3000': {'enemies': 100, 'projectiles': 50, 'boss_shots': 3000},
+    'boss_pattern_2000': {'enemies': 100, 'projectiles': 50, 'pattern': 'storm', 'pattern_bullets': 2000},
+    # Horde piled onto the player, where crowd separation runs into its pair budget
+    'crowd_pile_2000': {'enemies': 2000, 'projectiles': 50, 'enemy_spread': 100},
+}
+
+# Bullet patterns only used here, in addition to BULLET_PATTERNS
+BENCH_PATTERNS = {
+    # Dense spinning ring that keeps about 2000 bullets in flight from the middle of the map
+    'storm': {'count': 16, 'spread': 360, 'spin': 7, 'interval': 50, 'speed': 4, 'damage': 0},
+}
+
+FRAME_BUDGET_MS = 1000 / 60  # Frame time that holds 60 FPS
+
+SPREAD = 1200  # Half-size of the square around the player the world is scattered in
+
+def camera_offset(player):
+    """Camera position centered on the player, clamped to the map."""
+    width, height = screen.get_size()
+    return (max(0, min(player.x - width // 2, MAP_WIDTH - width)),
+            max(0, min(player.y - height // 2, MAP_HEIGHT - height)))
+
+def view_rect(camera_x, camera_y):
+    """Map area drawn by the game: the window plus CULL_MARGIN on every side."""
+    width, height = screen.get_size()
+    return pygame.Rect(camera_x - CULL_MARGIN, camera_y - CULL_MARGIN,
+                       width + 2 * CULL_MARGIN, height + 2 * CULL_MARGIN)
+
+def random_point(rng_, player, spread=SPREAD):
+    """A point scattered up to `spread` around the player, inside the map."""
+    return (min(MAP_WIDTH - 1, max(0, player.x + rng_.uniform(-spread, spread))),
+            min(MAP_HEIGHT - 1, max(0, player.y + rng_.uniform(-spread, spread))))
+
+def spawn_projectile(rng_, player):
+    """Fire a projectile in a random direction from a random point near the player."""
+    camera_x, camera_y = camera_offset(player)
+    fire_projectile(player, camera_x, camera_y, rng_.uniform(0, 1366), rng_.uniform(0, 768))
+    slot = projectile_store.count - 1
+    projectile_store.x[slot], projectile_store.y[slot] = random_point(rng_, player)
+    projectile_store.prev_x[slot], projectile_store.prev_y[slot] = projectile_store.x[slot], projectile_store.y[slot]
+
+def spawn_boss_shot(rng_, player):
+    """Add a boss projectile at a random point near the player, flying in a random direction."""
+    angle = rng_.uniform(0, 2 * math.pi)
+    projectile_store.add(*random_point(rng_, player), math.cos(angle), math.sin(angle), 6, 40,
+                         ENEMY_TEAM, BOSS_SHOT, 60, 25)
+
+def build_world(config, seed):
+    """Reset the shared game state and populate it for a scenario."""
+    rng_ = random.Random(seed)
+    rng.seed_streams(seed)
+    game_clock.reset()
+    projectile_store.clear()
+    xp_drops.clear()
+
+    player = Player()
+    player.x, player.y = MAP_WIDTH / 2, MAP_HEIGHT / 2
+    player.prev_x, player.prev_y = player.x, player.y
+    player.health = player.max_health = float('inf')  # Keep the player alive through every frame
+
+    enemy_manager = EnemyManager()
+    for _ in range(config['enemies']):
+        enemy_type = rng_.choice([BatEnemy, SkeletonEnemy, BlobEnemy])
+        enemy = enemy_type(*random_point(rng_, player, config.get('enemy_spread', SPREAD)))
+        enemy.hp = enemy.max_hp = float('inf')  # Keep the population stable
+        enemy_manager.add_enemy(enemy)
+
+    if config.get('pattern'):
+        # A Boss1Enemy firing only the scenario's pattern
+        pattern_boss = Boss1Enemy(player.x + 400, player.y)
+        pattern_boss.hp = pattern_boss.max_hp = float('inf')
+        enemy_manager.add_enemy(pattern_boss)
+        Emitter(BENCH_PATTERNS[config['pattern']]).start(pattern_boss, player)
+
+        # Fill the air before timing starts, so the pattern is in its steady state
+        for _ in range(1200):
+            if projectile_store.count_team(ENEMY_TEAM) >= config['pattern_bullets']:
+                break
+            move_projectiles()
+            game_clock.advance()
+
+    if config.get('boss2'):
+        boss = Boss2Enemy(player.x + 400, player.y, num_skeletons=10, skeleton_cooldown=30)
+        boss.first_attack_delay = 0  # Start summoning right away
+        boss.hp = boss.max_hp = float('inf')
+        enemy_manager.add_enemy(boss)
+
+    for _ in range(config['projectiles']):
+        spawn_projectile(rng_, player)
+
+    for _ in range(config.get('boss_shots', 0)):
+        spawn_boss_shot(rng_, player)
+
+    for _ in range(config.get('xp_drops', 0)):
+        x, y = random_point(rng_, player)
+        xp_drops.append(new_xp_drop(x, y, 5))
+
+    return rng_, player, enemy_manager
+
+def run_scenario(config, frames, seed):
+    """Run a scenario and return the per-phase frame times in milliseconds."""
+    rng_, player, enemy_manager = build_world(config, seed)
+    timings = {phase: [] for phase in PHASES}
+    bullets = []  # Enemy projectiles in flight at every frame
+    no_save = lambda **kwargs: None
+
+    def timed(phase, func, *args):
+        start = time.perf_counter()
+        func(*args)
+        timings[phase].append((time.perf_counter() - start) * 1000)
+
+    for _ in range(frames):
+        camera_x, camera_y = camera_offset(player)
+        view = view_rect(camera_x, camera_y)
+
+        timed('update_enemies', enemy_manager.update_enemies, player.x, player.y)
+        timed('move_projectiles', move_projectiles)
+        timed('handle_projectile_collisions', enemy_manager.handle_projectile_collisions,
+              projectile_store, player, xp_drops, {}, no_save)
+        timed('enemy_projectile_hits', lambda: projectile_store.discard(projectile_store.hits(
+            ENEMY_TEAM, player.x, player.y, player.x + player.size, player.y + player.size)))
+        timed('handle_player_collisions', enemy_manager.handle_player_collisions, player)
+
+        screen.fill((0, 0, 0))
+        timed('draw_enemies', enemy_manager.draw_enemies, screen, camera_x, camera_y, player, 1.0, view)
+        timed('draw_projectiles', draw_projectiles, screen, camera_x, camera_y, 1.0, view)
+        timed('draw_xp_drops', draw_xp_drops, screen, camera_x, camera_y, view)
+
+        # Keep the projectile counts steady for the next frame
+        while projectile_store.count_team(PLAYER_TEAM) < config['projectiles']:
+            spawn_projectile(rng_, player)
+        for _ in range(config.get('boss_shots', 0) - projectile_store.count_team(ENEMY_TEAM)):
+            spawn_boss_shot(rng_, player)
+        bullets.append(projectile_store.count_team(ENEMY_TEAM))
+        timed('timers', game_clock.advance)  # Scheduled game logic, e.g. the boss's volleys
+
+    timings = {phase: samples for phase, samples in timings.items() if samples}
+    timings['frame'] = [sum(frame) for frame in zip(*timings.values())]
+    return timings, bullets
+
+def summarize(samples):
+    """Percentiles and mean of a list of frame times."""
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {
+        'p50': round(cuts[49], 4),
+        'p95': round(cuts[94], 4),
+        'p99': round(cuts[98], 4),
+        'mean': round(statistics.fmean(samples), 4),
+    }
+
+def compare(results, baseline, tolerance, min_delta):
+    """Print the p50 change of every phase against a baseline and return the regressions.
+
+    A phase regresses when its p50 grew by more than `tolerance` (relative) and
+    `min_delta` milliseconds, so timer noise on near-empty phases is ignored.
+    """
+    regressions = []
+    print(f"{'scenario':<18} {'phase':<30} {'baseline':>10} {'current':>10} {'change':>8}", file=sys.stderr)
+    for name, phases in results['scenarios'].items():
+        for phase, stats in phases.items():
+            reference = baseline.get('scenarios', {}).get(name, {}).get(phase)
+            if reference is None or reference['p50'] <= 0:
+                continue
+            change = stats['p50'] / reference['p50'] - 1
+            slower = change > tolerance and stats['p50'] - reference['p50'] > min_delta
+            flag = ' <-- slower' if slower else ''
+            print(f"{name:<18} {phase:<30} {reference['p50']:>10.4f} {stats['p50']:>10.4f} {change:>+7.1%}{flag}",
+                  file=sys.stderr)
+            if slower:
+                regressions.append((name, phase, change))
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Frame-time benchmark for the game's hot loop.")
+    parser.add_argument('--frames', type=int, default=300, help="frames to run per scenario")
+    parser.add_argument('--seed', type=int, default=1234, help="seed for the synthetic worlds")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help="run only these scenarios")
+    parser.add_argument('--output', metavar='FILE', help="also write the JSON results to a file")
+    parser.add_argument('--save-baseline', metavar='FILE', help="store the results as a baseline")
+    parser.add_argument('--baseline', metavar='FILE', help="compare the results against a stored baseline")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="allowed p50 slowdown before failing (0.15 = 15%%)")
+    parser.add_argument('--min-delta', type=float, default=0.05, help="ignore p50 changes smaller than this (ms)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    results = {
+        'meta': {
+            'frames': args.frames,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': numpy.__version__,
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+        },
+        'scenarios': {},
+    }
+
+    for name in args.scenario or SCENARIOS:
+        timings, bullets = run_scenario(SCENARIOS[name], args.frames, args.seed)
+        results['scenarios'][name] = {phase: summarize(samples) for phase, samples in timings.items()}
+        frame = results['scenarios'][name]['frame']
+        verdict = 'holds' if frame['p95'] <= FRAME_BUDGET_MS else 'misses'
+        print(f"{name}: p95 frame {frame['p95']:.2f} ms with {statistics.fmean(bullets):.0f} enemy bullets in flight, "
+              f"{verdict} 60 FPS", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as file:
+                file.write(output + '\n')
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        for key in ('frames', 'seed'):
+            if baseline.get('meta', {}).get(key) != results['meta'][key]:
+                print(f"warning: baseline was recorded with a different --{key}", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance, args.min_delta)
+        if regressions:
+            print(f"{len(regressions)} phase(s) slower than the baseline by more than {args.tolerance:.0%}", file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
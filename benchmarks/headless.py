@@ -0,0 +1,20 @@
+"""Headless setup shared by the benchmarks.
+
+Importing it selects the dummy SDL drivers and puts the repository root on
+sys.path and in the working directory, where assets are loaded from.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+
+def init_display(size=(1, 1)):
+    """Initialize pygame with a dummy display of `size` and return its surface."""
+    pygame.init()
+    return pygame.display.set_mode(size)
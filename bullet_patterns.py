@@ -0,0 +1,96 @@
+import math
+import numpy as np
+from game_clock import game_clock
+from rng import streams
+from projectile import projectile_store, ENEMY_TEAM, BOSS_SHOT
+
+# Fields every pattern starts from. Angles are in degrees, times in game milliseconds.
+PATTERN_DEFAULTS = {
+    'count': 1,        # Bullets per volley
+    'spread': 0,       # Arc the volley covers; 360 is a full ring
+    'aimed': False,    # Center the arc on the player, else on the emitter's current angle
+    'jitter': 0,       # Random offset of the whole volley, up to this many degrees either way
+    'spin': 0,         # Degrees the emitter's angle turns after every volley (spirals)
+    'interval': 1000,  # Time between two volleys
+    'burst': 1,        # Volleys fired `interval` apart before pausing
+    'cooldown': 0,     # Extra pause after a burst
+    'speed': 4,        # Distance per tick
+    'damage': None,    # None uses the owner's damage
+    'size': (20, 20),  # Hit box of every bullet
+}
+
+# Bullet patterns bosses can fire, by name
+BULLET_PATTERNS = {
+    # Evenly spaced ring, turning a little between rings so gaps don't line up
+    'ring': {'count': 24, 'spread': 360, 'spin': 7.5, 'interval': 3000, 'speed': 4, 'damage': 20},
+    # Four arms sweeping around the boss for two seconds, then a break
+    'spiral': {'count': 4, 'spread': 360, 'spin': 11, 'interval': 50, 'burst': 40, 'cooldown': 3000,
+               'speed': 4, 'damage': 15},
+    # Wall of bullets spread over 60 degrees toward the player
+    'fan': {'count': 9, 'spread': 60, 'aimed': True, 'interval': 2500, 'speed': 5, 'damage': 20},
+    # Quick string of shots at the player, each slightly off
+    'aimed_burst': {'count': 1, 'aimed': True, 'jitter': 6, 'interval': 100, 'burst': 6, 'cooldown': 2000,
+                    'speed': 7, 'damage': 25},
+}
+
+class Emitter:
+    """Fires one bullet pattern from its owner, writing whole volleys into projectile_store."""
+    def __init__(self, pattern, delay=0):
+        """`pattern` is a name from BULLET_PATTERNS or a dict of the same form; `delay` (ms) precedes the first volley."""
+        if isinstance(pattern, str):
+            pattern = BULLET_PATTERNS[pattern]
+        self.pattern = {**PATTERN_DEFAULTS, **pattern}
+        self.angle = 0  # Direction (degrees) of the next unaimed volley
+        self.volleys_left = self.pattern['burst']  # Volleys before the next cooldown
+        self.delay = delay
+
+        # Angle of every bullet relative to the volley direction
+        count = self.pattern['count']
+        spread = self.pattern['spread']
+        if spread >= 360:
+            self.offsets = np.arange(count) * (360 / count)
+        else:
+            self.offsets = np.linspace(-spread / 2, spread / 2, count)
+
+    def start(self, owner, player):
+        """Fire at `player` from the center of `owner` until the owner leaves play."""
+        game_clock.schedule(self.delay / 1000, self.fire_volley, owner, player)
+
+    def fire_volley(self, owner, player):
+        """Fire one volley and schedule the next."""
+        if owner._store is None:
+            return  # The owner was defeated or removed
+        pattern = self.pattern
+        self.fire(owner, player)
+
+        self.volleys_left -= 1
+        if self.volleys_left > 0:
+            wait = pattern['interval']
+        else:
+            self.volleys_left = pattern['burst']
+            wait = pattern['interval'] + pattern['cooldown']
+        game_clock.schedule(wait / 1000, self.fire_volley, owner, player)
+
+    def fire(self, owner, player):
+        """Add one volley of bullets to the projectile store."""
+        pattern = self.pattern
+        origin_x = owner.x + owner.size[0] // 2
+        origin_y = owner.y + owner.size[1] // 2
+
+        if pattern['aimed']:
+            direction = math.degrees(math.atan2(player.y + player.size // 2 - origin_y,
+                                                player.x + player.size // 2 - origin_x))
+        else:
+            direction = self.angle
+        if pattern['jitter']:
+            direction += streams['boss_shots'].uniform(-pattern['jitter'], pattern['jitter'])
+        self.angle = (self.angle + pattern['spin']) % 360
+
+        angles = np.radians(direction + self.offsets)
+        count = len(angles)
+        damage = owner.damage if pattern['damage'] is None else pattern['damage']
+        width, height = pattern['size']
+        projectile_store.add_many(
+            np.full(count, origin_x, dtype=np.float64), np.full(count, origin_y, dtype=np.float64),
+            np.cos(angles), np.sin(angles), pattern['speed'], damage, ENEMY_TEAM, BOSS_SHOT, width, height
+        )
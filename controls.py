@@ -0,0 +1,159 @@
+import math
+import random
+from collections import namedtuple
+import numpy as np
+import pygame
+from settings import *
+from xp import xp_drops
+from projectile import projectile_store, ENEMY_TEAM
+from world import world
+
+# Input for one game tick: movement keys and the aim point in screen coordinates
+InputState = namedtuple('InputState', ['up', 'down', 'left', 'right', 'aim_x', 'aim_y'])
+
+class KeyboardMouseInput:
+    """Reads the live keyboard and mouse."""
+    def poll(self, player, enemy_manager, camera_x, camera_y):
+        """Return the input for the current tick."""
+        keys = pygame.key.get_pressed()
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        return InputState(
+            up=bool(keys[pygame.K_w] or keys[pygame.K_UP]),
+            down=bool(keys[pygame.K_s] or keys[pygame.K_DOWN]),
+            left=bool(keys[pygame.K_a] or keys[pygame.K_LEFT]),
+            right=bool(keys[pygame.K_d] or keys[pygame.K_RIGHT]),
+            aim_x=mouse_x,
+            aim_y=mouse_y
+        )
+
+class AutoPilotInput:
+    """Scripted stand-in for a human player, used by headless simulation runs."""
+    # Level-up picks, best first; 'health' comes first whenever health is below LOW_HEALTH
+    UPGRADE_PRIORITY = ('fire_rate', 'damage', 'max_health', 'speed', 'crit_chance', 'health')
+    LOW_HEALTH = 0.5  # Share of max health
+    LOOKAHEAD = 30  # Ticks ahead moves are judged at
+    THREAT_FALLOFF = 60  # Gap (pixels) over which an enemy's threat drops by e
+    SHOT_FALLOFF = 20  # Same for enemy projectiles, which are smaller and faster
+    SHOT_SAMPLES = (10, 20, 30)  # Ticks ahead projectiles are checked at; they cross a path quickly
+    DROP_WEIGHT = 0.25  # Score per pixel of LOOKAHEAD progress toward the XP drop we go for
+    # (up, down, left, right) key combinations, standing still included
+    MOVES = ((False, False, False, False),
+             (True, False, False, False), (False, True, False, False),
+             (False, False, True, False), (False, False, False, True),
+             (True, False, True, False), (True, False, False, True),
+             (False, True, True, False), (False, True, False, True))
+
+    def __init__(self, seed=0, threat_weight=250, edge_margin=150, guard_radius=200):
+        self.rng = random.Random(seed)
+        self.threat_weight = threat_weight  # Score a unit of threat costs, against drop progress
+        self.edge_margin = edge_margin
+        self.guard_radius = guard_radius  # Drops with an enemy this close are left alone
+        steps = np.array([(move[3] - move[2], move[1] - move[0]) for move in self.MOVES], dtype=np.float64)
+        lengths = np.hypot(steps[:, 0], steps[:, 1])
+        self.steps = steps / np.where(lengths > 0, lengths, 1)[:, None]  # Unit direction of every move
+
+    def poll(self, player, enemy_manager, camera_x, camera_y):
+        """Return the input for the current tick."""
+        center_x = player.x + player.size / 2
+        center_y = player.y + player.size / 2
+        reach = player.speed * self.LOOKAHEAD
+        target_x = center_x + self.steps[:, 0] * reach  # Where every move leads
+        target_y = center_y + self.steps[:, 1] * reach
+        if not world.endless:
+            target_x, target_y = np.clip(target_x, 0, MAP_WIDTH), np.clip(target_y, 0, MAP_HEIGHT)
+
+        store = enemy_manager.store
+        count = store.count
+        aim_x, aim_y = None, None
+        threat = np.zeros(len(self.MOVES))
+        if count:
+            enemy_x = store.x[:count] + store.width[:count] / 2
+            enemy_y = store.y[:count] + store.height[:count] / 2
+
+            # Gap left to every enemy once it has walked LOOKAHEAD ticks toward us
+            gap = (np.hypot(enemy_x[None, :] - target_x[:, None], enemy_y[None, :] - target_y[:, None])
+                   - np.maximum(store.width[:count], store.height[:count]) / 2 - player.size / 2
+                   - store.speed[:count] * self.LOOKAHEAD)
+            # Every enemy adds to the threat of a move, the closer the more, so moves lead away from crowds
+            threat = np.exp(-np.maximum(gap, 0) / self.THREAT_FALLOFF).sum(axis=1)
+
+            # Aim at the closest enemy
+            closest = int(np.hypot(enemy_x - center_x, enemy_y - center_y).argmin())
+            aim_x, aim_y = float(enemy_x[closest]), float(enemy_y[closest])
+
+        threat += self.shot_threat(center_x, center_y, player.speed, player.size)
+
+        if not world.endless:
+            # Map edges threaten like enemies standing on them, while a crowd is near enough to pin us there
+            pressure = min(float(threat.max()), 1)
+            for edge in (target_x, MAP_WIDTH - target_x, target_y, MAP_HEIGHT - target_y):
+                threat += np.exp(-np.maximum(edge - player.size / 2, 0) / self.edge_margin) * pressure
+        score = -threat * self.threat_weight
+
+        drop = self.safe_drop(center_x, center_y, player.speed, store)
+        if drop is not None:
+            # Head for the drop, unless that walks into the crowd; judged by direction so we don't overshoot it
+            to_x, to_y = drop.x - center_x, drop.y - center_y
+            distance = max(math.hypot(to_x, to_y), 1)
+            score += (self.steps[:, 0] * to_x + self.steps[:, 1] * to_y) / distance * reach * self.DROP_WEIGHT
+
+        if aim_x is None:
+            # No enemies yet: shoot in a random direction
+            angle = self.rng.uniform(0, 2 * math.pi)
+            aim_x = center_x + math.cos(angle) * 100
+            aim_y = center_y + math.sin(angle) * 100
+
+        up, down, left, right = self.MOVES[int(score.argmax())]
+        return InputState(
+            up=up,
+            down=down,
+            left=left,
+            right=right,
+            aim_x=int(aim_x - camera_x),
+            aim_y=int(aim_y - camera_y)
+        )
+
+    def shot_threat(self, center_x, center_y, speed, size):
+        """Threat of the enemy projectiles to every move, from where both stand at a few ticks ahead."""
+        store = projectile_store
+        shots = np.flatnonzero(store.team[:store.count] == ENEMY_TEAM)
+        threat = np.zeros(len(self.MOVES))
+        if not len(shots):
+            return threat
+        shot_x = store.x[shots] + store.width[shots] / 2
+        shot_y = store.y[shots] + store.height[shots] / 2
+        radius = np.maximum(store.width[shots], store.height[shots]) / 2 + size / 2
+        for ticks in self.SHOT_SAMPLES:
+            gap = (np.hypot(shot_x + store.dx[shots] * store.speed[shots] * ticks - (center_x + self.steps[:, 0, None] * speed * ticks),
+                            shot_y + store.dy[shots] * store.speed[shots] * ticks - (center_y + self.steps[:, 1, None] * speed * ticks))
+                   - radius)
+            threat += np.exp(-np.maximum(gap, 0) / self.SHOT_FALLOFF).sum(axis=1)
+        return threat
+
+    def safe_drop(self, center_x, center_y, speed, store):
+        """The closest XP drop we reach guard_radius ahead of every enemy, or None.
+
+        In the arena, drops within edge_margin of the map edges are left alone, as the horde pins us there.
+        """
+        count = store.count
+        enemy_x = store.x[:count] + store.width[:count] / 2
+        enemy_y = store.y[:count] + store.height[:count] / 2
+        margin = self.edge_margin
+        for xp in sorted(xp_drops, key=lambda xp: (xp.x - center_x) ** 2 + (xp.y - center_y) ** 2):
+            if not world.endless and not (margin < xp.x < MAP_WIDTH - margin and margin < xp.y < MAP_HEIGHT - margin):
+                continue
+            ticks = math.hypot(xp.x - center_x, xp.y - center_y) / speed
+            if not count or (np.hypot(enemy_x - xp.x, enemy_y - xp.y) - store.speed[:count] * ticks).min() > self.guard_radius:
+                return xp
+        return None
+
+    def choose_upgrade(self, player, options):
+        """Pick one of the offered level-up upgrades and return its index."""
+        priority = list(self.UPGRADE_PRIORITY)
+        if player.health < player.max_health * self.LOW_HEALTH:
+            priority.insert(0, 'health')
+        upgrades = [option["upgrade"] for option in options]
+        for upgrade in priority:
+            if upgrade in upgrades and player.stat_upgrades.get(upgrade, 0) < 6:
+                return upgrades.index(upgrade)
+        return self.rng.randrange(len(options))
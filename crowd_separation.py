@@ -0,0 +1,128 @@
+import math
+import numpy as np
+from settings import SEPARATION_PAIR_BUDGET
+
+SEPARATION_CELL_SIZE = 80  # Grid cell (pixels); at least the diameter of every ordinary enemy
+SEPARATION_STIFFNESS = 0.5  # Share of an overlap resolved per tick; lower is softer
+SEPARATION_MAX_PUSH = 3  # Farthest (pixels) an enemy is pushed in one tick
+GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))  # Spreads enemies stacked on the very same point
+
+class CrowdSeparation:
+    """Soft separation step that pushes overlapping enemies apart on a uniform grid.
+
+    At most `pair_budget` pairs are checked per tick; the rest wait for the following ticks.
+    """
+    def __init__(self, pair_budget=SEPARATION_PAIR_BUDGET):
+        self.pair_budget = pair_budget
+        self.cursor = 0  # Sorted position the next tick starts at when the budget runs short
+        self.pairs = 0  # Pairs checked on the last tick
+
+    def solve(self, store):
+        """Push the overlapping enemies of an EnemyStore apart by one tick's worth."""
+        n = store.count
+        self.pairs = 0
+        if n < 2:
+            return
+        width = store.width[:n]
+        height = store.height[:n]
+        center_x = store.x[:n] + width / 2
+        center_y = store.y[:n] + height / 2
+        radius = np.minimum(width, height) / 2
+        large = 2 * radius > SEPARATION_CELL_SIZE
+
+        large_i, large_j = self.large_pairs(center_x, center_y, radius, large)
+        grid_i, grid_j = self.grid_pairs(center_x[~large], center_y[~large], np.flatnonzero(~large),
+                                         max(self.pair_budget - len(large_i), 0))
+        i = np.concatenate((large_i, grid_i))
+        j = np.concatenate((large_j, grid_j))
+        self.pairs = len(i)
+
+        dx = center_x[i] - center_x[j]
+        dy = center_y[i] - center_y[j]
+        distance = np.hypot(dx, dy)
+        overlap = radius[i] + radius[j] - distance
+        touching = overlap > 0
+        if not touching.any():
+            return
+        i, j, dx, dy, distance, overlap = (i[touching], j[touching], dx[touching], dy[touching],
+                                           distance[touching], overlap[touching])
+
+        # Unit direction from j to i; enemies on the same point split along an angle set by the pair
+        stacked = distance == 0
+        angle = (i + j) * GOLDEN_ANGLE
+        side = np.where(i < j, 1.0, -1.0)
+        dx = np.where(stacked, np.cos(angle) * side, dx / np.where(stacked, 1, distance))
+        dy = np.where(stacked, np.sin(angle) * side, dy / np.where(stacked, 1, distance))
+
+        weight = width * height
+        push = overlap * weight[j] / (weight[i] + weight[j]) * SEPARATION_STIFFNESS
+        push_x = np.bincount(i, weights=dx * push, minlength=n)
+        push_y = np.bincount(i, weights=dy * push, minlength=n)
+
+        length = np.hypot(push_x, push_y)
+        scale = np.where(length > SEPARATION_MAX_PUSH, SEPARATION_MAX_PUSH / np.maximum(length, 1e-9), 1.0)
+        scale *= store.chases[:n]
+        store.x[:n] += push_x * scale
+        store.y[:n] += push_y * scale
+
+    def large_pairs(self, center_x, center_y, radius, large):
+        """(i, j) store slots pairing every `large` enemy with the others it may overlap, within the pair budget.
+
+        Ordinary enemies are taken from the cells a large one covers; large enemies are paired once each.
+        """
+        bigs = np.flatnonzero(large)
+        if not len(bigs):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        small = np.flatnonzero(~large)
+        cell_x = np.floor_divide(center_x[small], SEPARATION_CELL_SIZE)
+        cell_y = np.floor_divide(center_y[small], SEPARATION_CELL_SIZE)
+        firsts, seconds = [], []
+        for position, big in enumerate(bigs.tolist()):
+            reach = radius[big] + SEPARATION_CELL_SIZE / 2  # Farthest an ordinary enemy's center can overlap from
+            covered = ((cell_x >= (center_x[big] - reach) // SEPARATION_CELL_SIZE)
+                       & (cell_x <= (center_x[big] + reach) // SEPARATION_CELL_SIZE)
+                       & (cell_y >= (center_y[big] - reach) // SEPARATION_CELL_SIZE)
+                       & (cell_y <= (center_y[big] + reach) // SEPARATION_CELL_SIZE))
+            others = np.concatenate((small[covered], bigs[position + 1:]))
+            firsts.append(np.full(len(others), big))
+            seconds.append(others)
+        first = np.concatenate(firsts)[:self.pair_budget // 2]
+        second = np.concatenate(seconds)[:self.pair_budget // 2]
+        return np.concatenate((first, second)), np.concatenate((second, first))
+
+    def grid_pairs(self, center_x, center_y, slots, budget):
+        """(i, j) store slots of the enemies sharing a 3 x 3 block of cells, within `budget` pairs."""
+        n = len(slots)
+        if n < 2:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        # Bucket the centers; a column of cells spans `column` keys, padded so row -1 and +1 stay in it
+        cell_x = np.floor_divide(center_x, SEPARATION_CELL_SIZE).astype(np.int64)
+        cell_y = np.floor_divide(center_y, SEPARATION_CELL_SIZE).astype(np.int64)
+        cell_x -= cell_x.min()
+        cell_y -= cell_y.min() - 1
+        column = cell_y.max() + 2
+        key = cell_x * column + cell_y
+        order = np.argsort(key, kind='stable')
+        sorted_key = key[order]
+
+        # Range (in sorted order) of every enemy's 3 x 3 neighbourhood, one column of cells at a time.
+        # Enemies are walked in sorted order too, as sorted queries make searchsorted much faster.
+        neighbours = sorted_key[:, None] + np.array([-1, 0, 1])[None, :] * column
+        starts = np.searchsorted(sorted_key, neighbours - 1, side='left')
+        counts = np.searchsorted(sorted_key, neighbours + 1, side='right') - starts
+
+        # Spend the budget on enemies in turn, from the cursor on
+        turn = (np.arange(n) + self.cursor % n) % n
+        spent = np.cumsum(counts[turn].sum(axis=1))
+        taken = max(1, int(np.searchsorted(spent, budget, side='right')))
+        chosen = turn[:taken]
+        self.cursor = (self.cursor + taken) % n
+
+        # Expand the chosen ranges into pairs, leaving out every enemy paired with itself
+        counts = counts[chosen].ravel()
+        first = np.repeat(starts[chosen].ravel() - (np.cumsum(counts) - counts), counts)
+        i = order[np.repeat(np.repeat(chosen, 3), counts)]
+        j = order[first + np.arange(int(counts.sum()))]
+        different = i != j
+        return slots[i[different]], slots[j[different]]
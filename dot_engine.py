@@ -0,0 +1,86 @@
+from game_clock import game_clock, TICK_RATE
+
+WHEEL_SLOTS = 256  # Game ticks covered by one turn of the timer wheel
+
+class DotEffect:
+    """One damage-over-time effect (burn, poison) on one enemy."""
+    __slots__ = ('enemy', 'generation', 'kind', 'damage', 'interval', 'end_tick', 'due_tick')
+
+class DotEngine:
+    """Schedules enemy damage-over-time on a timer wheel, slotted by the tick each effect is next due."""
+    def __init__(self):
+        self.wheel = [[] for _ in range(WHEEL_SLOTS)]  # Effects by due tick modulo WHEEL_SLOTS
+        self.active = {}  # (enemy, kind) -> effect with damage still to deal
+        self.next_tick = 0  # First game tick not processed yet
+
+    def clear(self):
+        """Drop every effect, e.g. at the start of a run."""
+        self.wheel = [[] for _ in range(WHEEL_SLOTS)]
+        self.active = {}
+        self.next_tick = game_clock.ticks
+
+    def apply(self, enemy, kind, damage, interval, duration):
+        """Start dealing `damage` every `interval` seconds for `duration` seconds, first right away.
+
+        An enemy already affected by `kind` keeps its current effect.
+        """
+        now = game_clock.ticks
+        effect = self.active.get((enemy, kind))
+        if effect is not None and effect.generation == enemy.generation and now <= effect.end_tick:
+            return
+
+        effect = DotEffect()
+        effect.enemy = enemy
+        effect.generation = enemy.generation
+        effect.kind = kind
+        effect.damage = damage
+        effect.interval = max(1, round(interval * TICK_RATE))
+        effect.end_tick = now + round(duration * TICK_RATE)
+        effect.due_tick = now
+        self.active[(enemy, kind)] = effect
+        self.schedule(effect)
+
+    def schedule(self, effect):
+        # Ticks already processed are handled on the next one
+        self.wheel[max(effect.due_tick, self.next_tick) % WHEEL_SLOTS].append(effect)
+
+    def drop(self, effect):
+        key = (effect.enemy, effect.kind)
+        if self.active.get(key) is effect:
+            del self.active[key]
+
+    def update(self):
+        """Deal the damage due up to the current tick. Returns the enemies it killed."""
+        killed = []
+        while self.next_tick <= game_clock.ticks:
+            tick = self.next_tick
+            self.next_tick += 1
+            slot = tick % WHEEL_SLOTS
+            due = self.wheel[slot]
+            if not due:
+                continue
+            self.wheel[slot] = []
+
+            for effect in due:
+                if effect.due_tick > tick:  # Due on a later turn of the wheel
+                    self.wheel[slot].append(effect)
+                    continue
+                enemy = effect.enemy
+                if enemy._store is None or enemy.generation != effect.generation or enemy.hp <= 0:
+                    self.drop(effect)  # The enemy left play (or another effect killed it this tick)
+                    continue
+
+                if enemy.take_damage(effect.damage):
+                    killed.append(enemy)
+                    self.drop(effect)
+                    continue
+
+                effect.due_tick += effect.interval
+                if effect.due_tick <= effect.end_tick:
+                    self.schedule(effect)
+                else:
+                    self.drop(effect)
+        return killed
+
+# Shared engine; reset_game() clears it for every run
+dot_engine = DotEngine()
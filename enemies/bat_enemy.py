@@ -1,11 +1,13 @@
 from enemies.enemy import Enemy
-import pygame
+from sprites import load_enemy_frames
 
 class BatEnemy(Enemy):
     """Basic flying bat enemy."""
+    __slots__ = ()
+    type_id = 0
+    flies = True
+
     def __init__(self, x, y):
-        # Load images specific to BatEnemy
-        images = [
-            pygame.image.load(f'./assets/images/enemies/bat/{i}.png') for i in range(4)
-        ]
+        # Shared frames specific to BatEnemy
+        images = load_enemy_frames('bat', 4, (50, 35))
         super().__init__(x, y, hp=15, speed=1.5, xp_value=5, damage=10, size=(50, 35), images=images)
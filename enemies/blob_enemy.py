@@ -1,13 +1,14 @@
 from enemies.enemy import Enemy
-import pygame
+from sprites import load_enemy_frames
 
 class BlobEnemy(Enemy):
     """Slow but high-health tank enemy."""
+    __slots__ = ('poison_damage', 'poison_duration', 'poison_tick_interval')
+    type_id = 2
+
     def __init__(self, x, y):
-        # Load images specific to TankEnemy
-        images = [
-            pygame.image.load(f'./assets/images/enemies/blob/{i}.png') for i in range(4)
-        ]
+        # Shared frames specific to BlobEnemy
+        images = load_enemy_frames('blob', 4, (80, 70))
         super().__init__(x, y, hp=50, speed=0.8, xp_value=20, damage=20, size=(80, 70), images=images)
         self.poison_damage = 3  # Damage per tick
         self.poison_duration = 10  # Poison lasts x seconds
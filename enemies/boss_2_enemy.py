@@ -1,15 +1,17 @@
 import math
-import pygame
-import random
 from enemies.enemy import Enemy
 from enemies.skeleton_enemy import SkeletonEnemy
+from sprites import load_enemy_frames
+from rng import streams
 
 class Boss2Enemy(Enemy):
     """Boss that spawns skeleton enemies and maintains a radius around the player."""
+    type_id = 4
+    chases_player = False  # Keeps its distance in move_relative_to_player instead
+    despawns = False
+
     def __init__(self, x, y, spawn_radius=200, num_skeletons=3, skeleton_cooldown=280):
-        images = [
-            pygame.image.load(f'./assets/images/enemies/boss_2/{i}.png') for i in range(56)
-        ]
+        images = load_enemy_frames('boss_2', 56, (150, 150))
         super().__init__(x, y, hp=1000, speed=2, xp_value=200, damage=20, size=(150, 150), images=images)
         self.spawn_radius = spawn_radius
         self.num_skeletons = num_skeletons
@@ -59,10 +61,12 @@ class Boss2Enemy(Enemy):
 
         if self.cooldown_timer <= 0:
             for _ in range(self.num_skeletons):
-                angle = random.uniform(0, 360)
-                offset_x = self.spawn_radius * random.uniform(0.8, 1.2) * math.cos(math.radians(angle))
-                offset_y = self.spawn_radius * random.uniform(0.8, 1.2) * math.sin(math.radians(angle))
-                skeleton = SkeletonEnemy(self.x + offset_x, self.y + offset_y)
+                angle = streams['boss_summons'].uniform(0, 360)
+                offset_x = self.spawn_radius * streams['boss_summons'].uniform(0.8, 1.2) * math.cos(math.radians(angle))
+                offset_y = self.spawn_radius * streams['boss_summons'].uniform(0.8, 1.2) * math.sin(math.radians(angle))
+                skeleton = enemy_manager.director.create(SkeletonEnemy)
+                skeleton.x = self.x + offset_x
+                skeleton.y = self.y + offset_y
                 enemy_manager.add_enemy(skeleton)
             self.cooldown_timer = self.skeleton_cooldown
         else:
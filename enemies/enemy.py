@@ -1,33 +1,68 @@
 import pygame
 from settings import *
-import math
+from sprites import get_flipped_frames
+
+def stored_attribute(name):
+    """Attribute kept in the manager's EnemyStore while the enemy is bound to it."""
+    local_name = '_' + name
+
+    def getter(self):
+        if self._store is None:
+            return getattr(self, local_name)
+        return getattr(self._store, name).item(self._slot)
+
+    def setter(self, value):
+        if self._store is None:
+            setattr(self, local_name, value)
+        else:
+            getattr(self._store, name)[self._slot] = value
+
+    return property(getter, setter)
 
 class Enemy:
     """Base class for all enemies."""
+    __slots__ = ('_store', '_slot', '_x', '_y', '_prev_x', '_prev_y', '_hp', '_speed',
+                 'max_hp', 'xp_value', 'damage', 'size', 'images', 'flipped_images',
+                 'current_image_index', 'animation_counter', 'animation_speed', 'generation')
+    type_id = -1  # Index of the enemy type in the EnemyStore
+    chases_player = True  # Moved by the vectorized chase step in EnemyManager
+    despawns = True  # Dropped with its chunk when left far behind in an endless world
+    flies = False  # Flies straight over obstacles instead of following the flow field
+
+    # Per-tick state lives in the EnemyStore arrays once the enemy is added
+    x = stored_attribute('x')
+    y = stored_attribute('y')
+    prev_x = stored_attribute('prev_x')
+    prev_y = stored_attribute('prev_y')
+    hp = stored_attribute('hp')
+    speed = stored_attribute('speed')
+
     def __init__(self, x, y, hp, speed, xp_value, damage, size, images):
+        self._store = None  # Not in an EnemyStore until EnemyManager.add_enemy
+        self._slot = -1
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.hp = hp
         self.max_hp = hp  # Store the maximum HP for the health ratio
         self.speed = speed
         self.xp_value = xp_value  # XP value when the enemy dies
         self.damage =  damage
         self.size = size
-        self.images = [pygame.transform.scale(img, self.size) for img in images]
+        # Frames come pre-scaled from the sprite registry and are shared by every instance
+        self.images = images
+        self.flipped_images = get_flipped_frames(images)
         self.current_image_index = 0
         self.animation_counter = 0
-        self.animation_speed = 10
-
-    def move_toward_player(self, player_x, player_y):
-        """Move the enemy toward the player."""
-        dx = player_x - self.x
-        dy = player_y - self.y
-        distance = math.sqrt(dx ** 2 + dy ** 2)
-        if distance > 0:
-            dx /= distance
-            dy /= distance
-        self.x += dx * self.speed
-        self.y += dy * self.speed
+        self.animation_speed = 5  # Game frames per animation frame
+        self.generation = 0  # Bumped on reuse, so effects aimed at the previous life are dropped
+
+    def reset(self):
+        """Return a pooled enemy (not bound to a store) to the state of a new one."""
+        generation = self.generation
+        self.__init__(0, 0)
+        self.generation = generation + 1
 
     def take_damage(self, damage):
         """Reduce health and return True if the enemy dies."""
@@ -37,36 +72,45 @@ class Enemy:
     def is_dead(self):
         return self.hp <= 0
 
-    def draw(self, screen, camera_x, camera_y, player):
-        """Draw the enemy and its HP bar."""
-        # Update animation frame
+    def animate(self):
+        """Advance the animation by one game tick."""
         self.animation_counter += 1
         if self.animation_counter >= self.animation_speed:
             self.animation_counter = 0
             self.current_image_index = (self.current_image_index + 1) % len(self.images)
 
+    def get_draw_position(self, alpha=1.0):
+        """Position interpolated between the last two ticks (alpha 0 = previous, 1 = current)."""
+        prev_x, prev_y = self.prev_x, self.prev_y
+        return prev_x + (self.x - prev_x) * alpha, prev_y + (self.y - prev_y) * alpha
+
+    def draw(self, screen, camera_x, camera_y, player, alpha=1.0):
+        """Draw the enemy and its HP bar."""
+        x, y = self.get_draw_position(alpha)
+
         # Determine if the enemy is to the right of the player
         flip_image = self.x > player.x
 
-        # Flip the image if necessary
-        image_to_draw = pygame.transform.flip(self.images[self.current_image_index], flip_image, False)
+        # Pick the mirrored frame if necessary
+        frames = self.flipped_images if flip_image else self.images
+        image_to_draw = frames[self.current_image_index]
 
         # Draw the enemy sprite
         screen.blit(image_to_draw, (
-            self.x - camera_x,
-            self.y - camera_y
+            x - camera_x,
+            y - camera_y
         ))
 
         # Draw the HP bar above the enemy
         health_ratio = max(0, self.hp / self.max_hp)  # Ensure ratio is never below 0
         pygame.draw.rect(screen, BLACK, (
-            self.x - camera_x,
-            self.y - camera_y - 10,  # Position above the enemy
+            x - camera_x,
+            y - camera_y - 10,  # Position above the enemy
             self.size[0], 5  # Match enemy width
         ))
         pygame.draw.rect(screen, GREEN if health_ratio > 0.6 else YELLOW if health_ratio > 0.3 else RED, (
-            self.x - camera_x,
-            self.y - camera_y - 10,
+            x - camera_x,
+            y - camera_y - 10,
             self.size[0] * health_ratio, 5  # Scale width based on health ratio
         ))
 
@@ -1,13 +1,14 @@
 # enemies/bat_enemy.py
 
 from enemies.enemy import Enemy
-import pygame
+from sprites import load_enemy_frames
 
 class SkeletonEnemy(Enemy):
     """Basic flying bat enemy."""
+    __slots__ = ()
+    type_id = 1
+
     def __init__(self, x, y):
-        # Load images specific to BatEnemy
-        images = [
-            pygame.image.load(f'./assets/images/enemies/skeleton/{i}.png') for i in range(4)
-        ]
+        # Shared frames specific to SkeletonEnemy
+        images = load_enemy_frames('skeleton', 4, (50, 50))
         super().__init__(x, y, hp=10, speed=3, xp_value=10, damage=25, size=(50, 50), images=images)
@@ -1,19 +1,36 @@
 import json
+import numpy as np
 import pygame
 from enemies.__init__ import *
 from abilities.__init__ import *
 import player
 from settings import *
-import random
+from spatial_grid import SpatialGrid
+from enemy_store import EnemyStore
+from flow_field import FlowField
+from crowd_separation import CrowdSeparation
+from game_clock import game_clock
+from rng import streams
+from tracer import traced
+from hitch_detector import hitch_detector
+from world import world
+from spawn_director import SpawnDirector
+from projectile import PLAYER_TEAM, CRIT_SHOT
+from xp import new_xp_drop
 
 class EnemyManager:
     """Manages all enemy-related logic."""
     def __init__(self):
-        self.enemies = []
+        self.store = EnemyStore()  # Contiguous position, speed and HP arrays of every enemy
+        self.enemies = self.store.enemies  # Live enemies, in store slot order
         self.spawn_timer = 0
         self.base_spawn_interval = 140  # Base spawn interval (frames)
         self.spawn_interval = self.base_spawn_interval
         self.boss_spawned = False
+        self.grid = SpatialGrid(cell_size=128)  # Broad phase for collision checks
+        self.flow_field = FlowField()  # Ground enemies' way around obstacles to the player
+        self.separation = CrowdSeparation()  # Keeps the horde from piling onto one point
+        self.director = SpawnDirector()  # Spawn ring, despawning and enemy pools
         self.level_enemy_map = {
             1: {"enemies": [(BatEnemy, 1)]},  # Only bats
             2: {"enemies": [(BatEnemy, 3), (SkeletonEnemy, 1)]},  # Bats are more common
@@ -38,11 +55,23 @@ class EnemyManager:
         self.spawn_interval = max(30, self.base_spawn_interval - (player_level * 5))
 
     def add_enemy(self, enemy):
-        """Add a new enemy to the list."""
-        self.enemies.append(enemy)
+        """Add a new enemy to the end of the list."""
+        self.store.add(enemy)
+        hitch_detector.note('enemy_spawned', type=type(enemy).__name__)
 
-    def spawn_enemy(self, player_level):
+    def remove_enemy(self, enemy):
+        """Remove an enemy in O(1); the last enemy of the list takes its place."""
+        self.store.remove(enemy)
+
+    def defeated_enemies(self):
+        """Enemies whose HP dropped to 0 or below, found with one pass over the HP array."""
+        n = self.store.count
+        return [self.enemies[slot] for slot in np.flatnonzero(self.store.hp[:n] <= 0)]
+
+    @traced('spawn_enemy')
+    def spawn_enemy(self, player):
         """Spawn a new enemy or boss based on the player's level."""
+        player_level = player.level
         if player_level not in self.level_enemy_map:
             player_level = max(self.level_enemy_map.keys())  # Cap at highest level configuration
 
@@ -51,7 +80,10 @@ class EnemyManager:
             if not any(isinstance(enemy, Boss1Enemy) for enemy in self.enemies):
                 if not self.boss_spawned:
                 # Spawn the boss in the center of the map
-                    self.enemies.append(Boss1Enemy(MAP_WIDTH // 2, MAP_HEIGHT // 2))
+                    boss = Boss1Enemy(*world.boss_spawn_point())
+                    self.add_enemy(boss)
+                    boss.engage(player)
+                    hitch_detector.note('boss_spawned', type='Boss1Enemy')
                     self.boss_spawned = True
                     game_music.stop()
                     boss_spawn_sound.play()
@@ -61,7 +93,8 @@ class EnemyManager:
         if player_level == 10:
             if not any(isinstance(enemy, Boss2Enemy) for enemy in self.enemies):
                 if not self.boss_spawned:
-                    self.enemies.append(Boss2Enemy(MAP_WIDTH // 2, MAP_HEIGHT // 2))
+                    self.add_enemy(Boss2Enemy(*world.boss_spawn_point()))
+                    hitch_detector.note('boss_spawned', type='Boss2Enemy')
                     self.boss_spawned = True
                     game_music.stop()
                     boss_spawn_sound.play()
@@ -84,7 +117,7 @@ class EnemyManager:
         enemy_types = level_config["enemies"]
 
         # Weighted random choice based on spawn weights
-        enemy_type = random.choices(
+        enemy_type = streams['spawn'].choices(
             [etype for etype, _ in enemy_types], 
             weights=[weight for _, weight in enemy_types],
             k=1
@@ -99,90 +132,117 @@ class EnemyManager:
         elif player_level >= 6:
             health_multiplier = 1.2  # 20% extra health
 
-        # Instantiate enemy and scale its health
-        enemy_instance = enemy_type(x=0, y=0)  # Temporarily initialize
+        # Instantiate (or reuse) the enemy and scale its health
+        enemy_instance = self.director.create(enemy_type)
         enemy_instance.max_hp = int(enemy_instance.max_hp * health_multiplier)
         enemy_instance.hp = enemy_instance.max_hp  # Reset current HP to max HP
 
-        # Randomly choose a side for spawning
-        side = random.randint(0, 3)
-        if side == 0:  # Top edge
-            x, y = random.randint(0, MAP_WIDTH - enemy_instance.size[0]), -enemy_instance.size[1]
-        elif side == 1:  # Bottom edge
-            x, y = random.randint(0, MAP_WIDTH - enemy_instance.size[0]), MAP_HEIGHT
-        elif side == 2:  # Left edge
-            x, y = -enemy_instance.size[0], random.randint(0, MAP_HEIGHT - enemy_instance.size[1])
-        else:  # Right edge
-            x, y = MAP_WIDTH, random.randint(0, MAP_HEIGHT - enemy_instance.size[1])
-
-        # Update the enemy's position
+        # Place it on the spawn ring just outside the view
+        x, y = self.director.spawn_position(*enemy_instance.size)
         enemy_instance.x = x
         enemy_instance.y = y
 
         # Spawn the chosen enemy
-        self.enemies.append(enemy_instance)
+        self.add_enemy(enemy_instance)
+
+    def update_enemies(self, player_x, player_y):
+        """Update enemy positions, behaviors and animations by one tick."""
+        self.store.save_previous_positions()
+
+        # One vectorized step moves every chasing enemy toward the player, ground ones along the flow field
+        self.flow_field.update(player_x, player_y)
+        self.store.move_toward(player_x, player_y, self.flow_field)
+        self.separation.solve(self.store)
 
-    def update_enemies(self, player_x, player_y, player, screen, camera_x, camera_y):
-        """Update enemy positions and behaviors."""
         for enemy in self.enemies:
             if isinstance(enemy, Boss2Enemy):
-                enemy.update(player_x, player_y, self, (0, 0, MAP_WIDTH, MAP_HEIGHT))
-            else:
-                enemy.move_toward_player(player_x, player_y)
-                enemy.draw(screen, camera_x, camera_y, player)
+                enemy.update(player_x, player_y, self, world.playable_area())
+            enemy.animate()
+
+    def draw_enemies(self, screen, camera_x, camera_y, player, alpha=1.0, view=None):
+        """Draw all enemies, interpolated `alpha` of the way into the last tick.
 
-    def draw_enemies(self, screen, camera_x, camera_y, player):
-        """Draw all enemies."""
+        With a `view` rect (map coordinates) only enemies overlapping it are drawn.
+        """
+        if view is None:
+            for enemy in self.enemies:
+                enemy.draw(screen, camera_x, camera_y, player, alpha)
+            return
+
+        visible = self.store.overlapping(view.left, view.top, view.right, view.bottom, alpha)
         for enemy in self.enemies:
-            enemy.draw(screen, camera_x, camera_y, player)
+            if visible[enemy._slot]:
+                enemy.draw(screen, camera_x, camera_y, player, alpha)
+
+    def rebuild_grid(self):
+        """Bucket every enemy into the spatial grid by its current rect."""
+        self.grid.clear()
+        for index, enemy in enumerate(self.enemies):
+            rect = enemy.get_rect()
+            self.grid.insert((index, enemy, rect), rect.x, rect.y, rect.width, rect.height)
 
     # Handle damage and collision logic
     def handle_projectile_collisions(self, projectiles, player, xp_drops, achievements, save_settings):
-        """Check for collisions between projectiles and enemies."""
-        for projectile in projectiles[:]:
-            projectile_rect = pygame.Rect(projectile['x'], projectile['y'], 10, 10)
-
-            for enemy in self.enemies[:]:
-                if projectile_rect.colliderect(enemy.get_rect()):
-                    # Play the appropriate sound effect
-                    if projectile['is_crit'] and crit_hit_sound:
-                        crit_hit_sound.play()
-                    elif normal_hit_sound:
-                        normal_hit_sound.play()
-
-                    # Apply burn or poison if abilities are active
-                    for ability in player.abilities:
-                        if isinstance(ability, BurningAbility) and ability.active:
-                            ability.apply_burn(enemy)
-
-                    for ability in player.abilities:
-                        if isinstance(ability, PoisonAbility) and ability.active:
-                            ability.apply_poison(enemy)
-
-                    # Check if the enemy is dead
-                    if enemy.take_damage(projectile['damage']):
-                        # Pass `save_settings` to `handle_enemy_defeat`
-                        self.handle_enemy_defeat(enemy, player, xp_drops, achievements, save_settings)
-                    
-                    # Remove the projectile after collision
-                    projectiles.remove(projectile)
-                    break
+        """Check for collisions between the player's projectiles (a ProjectileStore) and enemies."""
+        self.rebuild_grid()
+        defeated = set()  # List indices of enemies removed during this pass
+        spent = []  # Slots of the projectiles that hit, dropped after the pass
+
+        for slot in np.flatnonzero(projectiles.team[:projectiles.count] == PLAYER_TEAM).tolist():
+            x = projectiles.x.item(slot)
+            y = projectiles.y.item(slot)
+            width = projectiles.width.item(slot)
+            height = projectiles.height.item(slot)
+            projectile_rect = pygame.Rect(x, y, width, height)
+
+            # Narrow phase: only enemies sharing a grid cell with the projectile.
+            # The lowest list index wins so hits resolve in the same order as a full scan.
+            target = None
+            for index, enemy, enemy_rect in self.grid.query(x, y, width, height):
+                if index in defeated or (target is not None and index >= target[0]):
+                    continue
+                if projectile_rect.colliderect(enemy_rect):
+                    target = (index, enemy)
+
+            if target is None:
+                continue
+
+            index, enemy = target
+            spent.append(slot)
+
+            # Play the appropriate sound effect
+            if projectiles.sprite[slot] == CRIT_SHOT and crit_hit_sound:
+                crit_hit_sound.play()
+            elif normal_hit_sound:
+                normal_hit_sound.play()
+
+            # Abilities that react to hits (burn, poison)
+            for hook in player.ability_hooks['on_projectile_hit']:
+                hook(player, enemy)
+
+            # Check if the enemy is dead
+            if enemy.take_damage(projectiles.damage.item(slot)):
+                # Pass `save_settings` to `handle_enemy_defeat`
+                self.handle_enemy_defeat(enemy, player, xp_drops, achievements, save_settings)
+                defeated.add(index)
+
+        # Drop every projectile that collided, in one pass
+        projectiles.discard(spent)
 
     def handle_player_collisions(self, player):
         """Check for collisions between the player and enemies."""
         player_rect = pygame.Rect(player.x, player.y, player.size, player.size)
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
 
-        for enemy in self.enemies[:]:
+        for enemy in self.enemies:
             if player_rect.colliderect(enemy.get_rect()):
                 # Check if enough time has passed since the player was last damaged
                 if current_time - player.last_damage_time >= player.invincibility_time * 1000:
                     
-                    # Check for active ShieldAbility
-                    for ability in player.abilities:
-                        if isinstance(ability, ShieldAbility) and ability.block():
-                            block_hit_sound.play()
-                            return False  # Collision detected but damage was blocked
+                    # Let abilities (the shield) block the hit
+                    if player.block_hit():
+                        block_hit_sound.play()
+                        return False  # Collision detected but damage was blocked
 
                     # Apply damage to the player
                     player.health -= enemy.damage
@@ -201,6 +261,7 @@ class EnemyManager:
 
         return False  # No collision
 
+    @traced('handle_enemy_defeat')
     def handle_enemy_defeat(self, enemy, player, xp_drops, achievements, save_settings):
         """Handle the logic when an enemy is defeated."""
         # Handle boss defeat logic
@@ -222,7 +283,7 @@ class EnemyManager:
             if not any(isinstance(a, BurningAbility) for a in player.abilities):
                 burning_ability = BurningAbility()
                 burning_ability.active = True
-                player.abilities.append(burning_ability)
+                player.add_ability(burning_ability)
                 ability_obtained_sound.play()
         
         elif isinstance(enemy, Boss2Enemy):
@@ -243,7 +304,7 @@ class EnemyManager:
             if not any(isinstance(a, PoisonAbility) for a in player.abilities):
                 poison_ability = PoisonAbility()
                 poison_ability.active = True
-                player.abilities.append(poison_ability)
+                player.add_ability(poison_ability)
                 ability_obtained_sound.play()
 
         # Handle other enemy-specific logic
@@ -258,9 +319,9 @@ class EnemyManager:
             bat_death_sound.play()
 
         # Remove the enemy and drop XP
-        self.enemies.remove(enemy)
-        xp_drops.append({
-            'x': enemy.x,
-            'y': enemy.y,
-            'value': enemy.xp_value
-        })
+        self.remove_enemy(enemy)
+        xp_drops.append(new_xp_drop(enemy.x, enemy.y, enemy.xp_value))
+
+        # Abilities that react to kills
+        for hook in player.ability_hooks['on_enemy_killed']:
+            hook(player, enemy)
@@ -0,0 +1,128 @@
+import numpy as np
+
+class EnemyStore:
+    """Structure-of-arrays storage for enemy kinematics and health.
+
+    Bound enemies read and write their slot instead of attributes of their own.
+    """
+    def __init__(self, capacity=256):
+        self.count = 0  # Number of occupied slots (always the first `count`)
+        self.enemies = []  # Enemy bound to each occupied slot
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Create (or grow) the backing arrays, keeping the occupied slots."""
+        old = getattr(self, 'x', None)
+        self.capacity = capacity
+        fields = {
+            'x': np.float64,
+            'y': np.float64,
+            'prev_x': np.float64,  # Position at the previous tick, for render interpolation
+            'prev_y': np.float64,
+            'speed': np.float64,
+            'hp': np.float64,
+            'width': np.float64,
+            'height': np.float64,
+            'type_id': np.int16,
+            'chases': np.bool_,  # Moves toward the player every tick
+            'walks': np.bool_,  # Chases along the flow field (around obstacles) rather than in a straight line
+        }
+        for name, dtype in fields.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+
+    def add(self, enemy):
+        """Bind an enemy to a free slot, moving its state into the arrays."""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+
+        slot = self.count
+        self.x[slot] = enemy.x
+        self.y[slot] = enemy.y
+        self.prev_x[slot] = enemy.x  # No motion to interpolate on the first tick
+        self.prev_y[slot] = enemy.y
+        self.speed[slot] = enemy.speed
+        self.hp[slot] = enemy.hp
+        self.width[slot], self.height[slot] = enemy.size
+        self.type_id[slot] = enemy.type_id
+        self.chases[slot] = enemy.chases_player
+        self.walks[slot] = not enemy.flies
+
+        self.enemies.append(enemy)
+        self.count += 1
+        enemy._store = self
+        enemy._slot = slot
+
+    def remove(self, enemy):
+        """Unbind an enemy, moving the last occupied slot into the freed one."""
+        slot = enemy._slot
+
+        # Hand the values back so the enemy stays readable after removal
+        enemy._x = self.x.item(slot)
+        enemy._y = self.y.item(slot)
+        enemy._prev_x = self.prev_x.item(slot)
+        enemy._prev_y = self.prev_y.item(slot)
+        enemy._speed = self.speed.item(slot)
+        enemy._hp = self.hp.item(slot)
+        enemy._store = None
+        enemy._slot = -1
+
+        last = self.count - 1
+        if slot != last:
+            for array in (self.x, self.y, self.prev_x, self.prev_y, self.speed, self.hp,
+                          self.width, self.height, self.type_id, self.chases, self.walks):
+                array[slot] = array[last]
+            moved = self.enemies[last]
+            self.enemies[slot] = moved
+            moved._slot = slot
+        self.enemies.pop()
+        self.count = last
+
+    def clear(self):
+        """Unbind every enemy."""
+        while self.count:
+            self.remove(self.enemies[-1])
+
+    def save_previous_positions(self):
+        """Remember every position at the start of a tick for render interpolation."""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+    def overlapping(self, left, top, right, bottom, alpha=1.0):
+        """Boolean mask of the slots whose interpolated rect overlaps the given rectangle."""
+        n = self.count
+        prev_x = self.prev_x[:n]
+        prev_y = self.prev_y[:n]
+        x = prev_x + (self.x[:n] - prev_x) * alpha
+        y = prev_y + (self.y[:n] - prev_y) * alpha
+        return (x < right) & (x + self.width[:n] > left) & (y < bottom) & (y + self.height[:n] > top)
+
+    def move_toward(self, target_x, target_y, flow_field=None):
+        """Advance every chasing enemy one step toward the target point.
+
+        With a `flow_field`, walking enemies whose straight line is blocked take its direction instead.
+        """
+        n = self.count
+        if n == 0:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        dx = target_x - x
+        dy = target_y - y
+        distance = np.sqrt(dx * dx + dy * dy)
+
+        # Unit direction, left at zero for enemies already on the target
+        moving = (distance > 0) & self.chases[:n]
+        np.divide(dx, distance, out=dx, where=moving)
+        np.divide(dy, distance, out=dy, where=moving)
+        dx[~moving] = 0
+        dy[~moving] = 0
+        if flow_field is not None:
+            flow_field.steer(x + self.width[:n] / 2, y + self.height[:n] / 2, dx, dy, moving & self.walks[:n])
+
+        speed = self.speed[:n]
+        x += dx * speed
+        y += dy * speed
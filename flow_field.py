@@ -0,0 +1,157 @@
+import math
+import numpy as np
+from world import world
+
+FLOW_CELL_SIZE = 64  # Edge length (pixels) of a flow field cell
+
+# Neighbour offsets (row, column) and the cost of stepping to them
+NEIGHBOURS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+STEP_COSTS = (1, 1, 1, 1, math.sqrt(2), math.sqrt(2), math.sqrt(2), math.sqrt(2))
+
+class FlowField:
+    """Grid of walking distances to the player, used to steer ground enemies around obstacles.
+
+    Rebuilt only when the player enters another cell or the map changes.
+    """
+    def __init__(self):
+        self.bounds = None  # (left, top, right, bottom) covered by the grid
+        self.obstacle_version = None  # world.obstacle_version the blocked cells were built from
+        self.target_cell = None  # (row, column) of the player at the last rebuild
+        self.rebuilds = 0
+        self.rows = self.columns = 0
+        self.stride = 0  # Flat index distance between two rows, border included
+        self.blocked = self.near_blocked = self.distance = None
+        self.direction_x = self.direction_y = None
+        self.straight = None  # Cells with a clear line of sight to the target
+        self.detours = False  # Whether any cell is blocked at all
+
+    def cell_of(self, x, y):
+        """(row, column) of a map position, which may lie outside the grid."""
+        left, top = self.bounds[0], self.bounds[1]
+        return int((y - top) // FLOW_CELL_SIZE), int((x - left) // FLOW_CELL_SIZE)
+
+    def update(self, target_x, target_y):
+        """Rebuild the field if the target moved to another cell or the map changed."""
+        bounds = world.playable_area()
+        if bounds != self.bounds or world.obstacle_version != self.obstacle_version:
+            self.bounds = bounds
+            self.obstacle_version = world.obstacle_version
+            self.build_blocked()
+            self.target_cell = None
+
+        row, column = self.cell_of(target_x, target_y)
+        cell = (min(max(row, 0), self.rows - 1), min(max(column, 0), self.columns - 1))
+        if cell != self.target_cell:
+            self.target_cell = cell
+            if self.detours:  # Without obstacles every cell goes straight; nothing to compute
+                self.rebuild()
+
+    def build_blocked(self):
+        """Rasterize world.obstacles into the blocked cells, and the step costs around them."""
+        left, top, right, bottom = self.bounds
+        self.rows = -(-(bottom - top) // FLOW_CELL_SIZE)
+        self.columns = -(-(right - left) // FLOW_CELL_SIZE)
+        blocked = np.ones((self.rows + 2, self.columns + 2), dtype=np.bool_)
+        inner = blocked[1:-1, 1:-1]
+        inner[:] = False
+        for rect in world.obstacles:
+            first_row, first_column = self.cell_of(rect.left, rect.top)
+            last_row, last_column = self.cell_of(rect.right - 1, rect.bottom - 1)
+            inner[max(first_row, 0):max(last_row + 1, 0), max(first_column, 0):max(last_column + 1, 0)] = True
+        self.detours = bool(inner.any())
+        self.stride = self.columns + 2
+        self.blocked = blocked.ravel()
+
+        # Points within a quarter cell of a blocked cell, for line_of_sight, on a grid of half cells shifted
+        # by a quarter: half 2m holds the points only cell m reaches, half 2m + 1 those cells m and m + 1 do
+        half_rows = np.repeat(blocked, 2, axis=0)
+        half_rows[1::2] |= np.roll(blocked, -1, axis=0)
+        near = np.repeat(half_rows, 2, axis=1)
+        near[:, 1::2] |= np.roll(half_rows, -1, axis=1)
+        self.near_blocked = near.ravel()
+        self.offsets = [row * self.stride + column for row, column in NEIGHBOURS]
+
+        # Diagonal steps may not cut the corner of a blocked cell
+        self.step_costs = []
+        for (row, column), cost in zip(NEIGHBOURS, STEP_COSTS):
+            costs = np.full(self.blocked.size, cost)
+            if row and column:
+                corners = (np.roll(self.blocked, -row * self.stride) | np.roll(self.blocked, -column))
+                costs[corners] = np.inf
+            self.step_costs.append(costs)
+
+    def rebuild(self):
+        """Recompute the distances from the target cell, then every cell's direction."""
+        self.rebuilds += 1
+        stride = self.stride
+        blocked = self.blocked
+        target = (self.target_cell[0] + 1) * stride + self.target_cell[1] + 1
+        distance = np.full(blocked.size, np.inf)
+        distance[target] = 0
+
+        # Every pass relaxes all cells but the border against each neighbour
+        first, last = stride + 1, blocked.size - stride - 1
+        for _ in range(self.rows * self.columns):  # Converges long before; bounds the worst case
+            previous = distance.copy()
+            for offset, costs in zip(self.offsets, self.step_costs):
+                np.minimum(distance[first:last], distance[first + offset:last + offset] + costs[first:last],
+                           out=distance[first:last])
+            distance[blocked] = np.inf
+            distance[target] = 0  # The player may stand on an obstacle
+            if np.array_equal(distance, previous):
+                break
+        self.distance = distance
+
+        # Each cell points at the neighbour with the shortest way on
+        candidates = np.full((len(NEIGHBOURS), blocked.size), np.inf)
+        for index, (offset, costs) in enumerate(zip(self.offsets, self.step_costs)):
+            candidates[index, first:last] = distance[first + offset:last + offset] + costs[first:last]
+        best = np.argmin(candidates, axis=0)
+        reachable = np.isfinite(candidates[best, np.arange(blocked.size)]) & np.isfinite(distance)
+        steps = np.array(NEIGHBOURS, dtype=np.float64)
+        steps /= np.hypot(steps[:, 0], steps[:, 1])[:, None]
+        self.direction_x = np.where(reachable, steps[best, 1], 0)
+        self.direction_y = np.where(reachable, steps[best, 0], 0)
+
+        # Cells with a clear line of sight to the target aren't detoured. A line can only be clear where
+        # the path is as short as on an empty grid (octile distance), so only those cells are traced.
+        rows, columns = np.divmod(np.arange(blocked.size), stride)
+        row_gap = np.abs(rows - self.target_cell[0] - 1)
+        column_gap = np.abs(columns - self.target_cell[1] - 1)
+        octile = np.maximum(row_gap, column_gap) + (math.sqrt(2) - 1) * np.minimum(row_gap, column_gap)
+        straight = ~reachable
+        traced = np.flatnonzero(reachable & (distance <= octile + 1e-9))
+        straight[traced] = self.line_of_sight(rows[traced], columns[traced])
+        self.straight = straight
+
+    def line_of_sight(self, rows, columns):
+        """Whether the lines from the centers of the given (bordered) cells to the target cell's miss every blocked cell.
+
+        Lines are sampled at most every 0.47 cells and each sample checks the cells within a quarter cell
+        of it (looked up in near_blocked), so every cell a line crosses is checked, and some it only passes close to.
+        """
+        samples = 3 * max(int(np.max(np.maximum(np.abs(rows - self.target_cell[0] - 1),
+                                                np.abs(columns - self.target_cell[1] - 1)), initial=0)), 1)
+        t = np.linspace(0, 1, samples + 1)[None, :]
+        ys = rows[:, None] + 0.5 + (self.target_cell[0] + 1 - rows[:, None]) * t
+        xs = columns[:, None] + 0.5 + (self.target_cell[1] + 1 - columns[:, None]) * t
+        halves = np.floor(ys * 2 - 0.5).astype(np.int64) * (2 * self.stride) + np.floor(xs * 2 - 0.5).astype(np.int64)
+        return ~self.near_blocked[halves].any(axis=1)
+
+    def steer(self, xs, ys, dx, dy, walking):
+        """Replace the straight-line directions (dx, dy) of the `walking` points by the field's, in place.
+
+        Points outside the grid, or in cells with a clear line of sight to the target, keep their direction.
+        """
+        if not self.detours:
+            return
+        left, top = self.bounds[0], self.bounds[1]
+        rows = np.floor_divide(ys - top, FLOW_CELL_SIZE).astype(np.int64)
+        columns = np.floor_divide(xs - left, FLOW_CELL_SIZE).astype(np.int64)
+        inside = walking & (rows >= 0) & (rows < self.rows) & (columns >= 0) & (columns < self.columns)
+        cells = (rows[inside] + 1) * self.stride + columns[inside] + 1
+        detour = ~self.straight[cells]
+        steered = np.flatnonzero(inside)[detour]
+        cells = cells[detour]
+        dx[steered] = self.direction_x[cells]
+        dy[steered] = self.direction_y[cells]
@@ -0,0 +1,52 @@
+import time
+from collections import deque
+from tracer import tracer
+
+# Phases of a frame, in the order they run
+PHASES = ('input', 'spawn', 'enemies', 'projectiles', 'collisions', 'effects', 'draw', 'hud', 'overlay', 'flip')
+HISTORY_FRAMES = 240  # Frames of history kept for the overlay graph
+
+class FrameTimer:
+    """Splits every frame of the game loop into named phases and times them.
+
+    lap(phase) adds the time since the previous lap to `phase`; end_frame() closes the frame.
+    """
+    def __init__(self):
+        self.frame = 0  # Number of the current frame
+        self.frame_start = time.perf_counter()
+        self.last_lap = self.frame_start
+        self.phases = dict.fromkeys(PHASES, 0.0)  # Seconds spent in each phase this frame
+        self.frame_times = deque(maxlen=HISTORY_FRAMES)  # Milliseconds per frame
+        self.phase_history = deque(maxlen=HISTORY_FRAMES)  # Phase totals (ms) per frame
+
+    def skip(self):
+        """Start the next phase now, leaving the time since the last lap unaccounted."""
+        self.last_lap = time.perf_counter()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap to `phase`."""
+        now = time.perf_counter()
+        self.phases[phase] += now - self.last_lap
+        if tracer.enabled:
+            tracer.add_span(phase, 'phase', self.last_lap, now)
+        self.last_lap = now
+
+    def restart_frame(self):
+        """Drop the current frame's timings, e.g. after time spent in a menu."""
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = self.last_lap = time.perf_counter()
+
+    def end_frame(self):
+        """Close the current frame and start the next one."""
+        now = time.perf_counter()
+        self.frame_times.append((now - self.frame_start) * 1000)
+        if tracer.enabled:
+            tracer.add_span('frame', 'frame', self.frame_start, now, {"frame": self.frame})
+        self.phase_history.append({phase: seconds * 1000 for phase, seconds in self.phases.items()})
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.frame += 1
+        self.frame_start = now
+        self.last_lap = now
+
+# Shared timer used by the game loop
+frame_timer = FrameTimer()
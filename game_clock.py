@@ -0,0 +1,58 @@
+import heapq
+
+TICK_RATE = 60  # Simulation ticks per second
+TICK_MS = 1000 / TICK_RATE
+MAX_FRAME_MS = 250  # Longest real-time gap simulated in one frame; longer stalls slow the game down
+
+class Timer:
+    """A callback waiting on the game clock; see GameClock.schedule()."""
+    __slots__ = ('due_tick', 'callback', 'args', 'cancelled')
+
+    def cancel(self):
+        """Stop the callback from being called."""
+        self.cancelled = True
+
+class GameClock:
+    """Simulation clock advanced once per game tick, and the scheduler of timed game logic."""
+    def __init__(self):
+        self.ticks = 0  # Ticks simulated since the start of the run
+        self.time_scale = 1.0  # Game speed in the real-time loops (2 = twice as fast)
+        self.timers = []  # Heap of (due tick, order scheduled, Timer)
+        self.scheduled = 0  # Timers scheduled so far; timers due on the same tick run in this order
+
+    def reset(self):
+        """Restart the clock at the beginning of a run, dropping every timer."""
+        self.ticks = 0
+        self.timers = []
+        self.scheduled = 0
+
+    def advance(self):
+        """Move the clock forward by one tick and run the timers due on it."""
+        self.ticks += 1
+        timers = self.timers
+        while timers and timers[0][0] <= self.ticks:
+            timer = heapq.heappop(timers)[2]
+            if not timer.cancelled:
+                timer.callback(*timer.args)
+
+    def schedule(self, delay, callback, *args):
+        """Call callback(*args) once `delay` game seconds from now (at least one tick). Returns its Timer."""
+        timer = Timer()
+        timer.due_tick = self.ticks + max(1, round(delay * TICK_RATE))
+        timer.callback = callback
+        timer.args = args
+        timer.cancelled = False
+        self.scheduled += 1
+        heapq.heappush(self.timers, (timer.due_tick, self.scheduled, timer))
+        return timer
+
+    def get_ticks(self):
+        """Simulated milliseconds since the start of the run."""
+        return int(self.ticks * TICK_MS)
+
+    def time(self):
+        """Simulated seconds since the start of the run."""
+        return self.ticks / TICK_RATE
+
+# Shared clock used by every game system
+game_clock = GameClock()
@@ -0,0 +1,70 @@
+import json
+import logging
+import os
+import time
+from collections import Counter
+from logging.handlers import RotatingFileHandler
+
+HITCH_LOG_PATH = './logs/hitches.log'
+HITCH_LOG_BYTES = 1024 * 1024  # Size at which the log is rotated
+HITCH_LOG_BACKUPS = 3  # Rotated logs kept next to the current one
+MAX_FRAME_EVENTS = 200  # Events kept per frame (menus can note many between frames)
+
+class HitchDetector:
+    """Watchdog that logs the events and phase timings of frames that ran over budget."""
+    def __init__(self):
+        self.enabled = False
+        self.budget_ms = 1000 / 30
+        self.path = HITCH_LOG_PATH
+        self.events = []  # Events noted during the current frame
+        self.surfaces = Counter()  # Surfaces created during the current frame, per source
+        self.logger = None
+        self.hitches = 0
+
+    def note(self, event, **details):
+        """Record that `event` happened during the current frame."""
+        if self.enabled and len(self.events) < MAX_FRAME_EVENTS:
+            details["event"] = event
+            self.events.append(details)
+
+    def count_surfaces(self, source, count=1):
+        """Record `count` new surfaces created by `source` during the current frame."""
+        if self.enabled:
+            self.surfaces[source] += count
+
+    def clear(self):
+        """Forget the events of the current frame, e.g. after time spent in a menu."""
+        self.events = []
+        self.surfaces = Counter()
+
+    def check(self, timer, count_entities):
+        """Log the frame `timer` just closed if it ran over budget. Returns the record, if any."""
+        record = None
+        if self.enabled and timer.frame_times and timer.frame_times[-1] > self.budget_ms:
+            record = {
+                "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "frame": timer.frame - 1,
+                "frame_ms": round(timer.frame_times[-1], 2),
+                "budget_ms": round(self.budget_ms, 2),
+                "phases": {phase: round(ms, 2) for phase, ms in timer.phase_history[-1].items()},
+                "events": self.events,
+                "surfaces": dict(self.surfaces),
+                "entities": count_entities(),
+            }
+            self.write(record)
+        self.clear()
+        return record
+
+    def write(self, record):
+        if self.logger is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            handler = RotatingFileHandler(self.path, maxBytes=HITCH_LOG_BYTES, backupCount=HITCH_LOG_BACKUPS)
+            self.logger = logging.getLogger('hitches')
+            self.logger.setLevel(logging.INFO)
+            self.logger.propagate = False  # Keep hitch records out of the console
+            self.logger.addHandler(handler)
+        self.logger.info(json.dumps(record))
+        self.hitches += 1
+
+# Shared watchdog; configure it with HITCH_BUDGET_MS in settings.py
+hitch_detector = HitchDetector()
@@ -0,0 +1,192 @@
+import pygame
+from abilities.__init__ import *
+from settings import *
+from sprites import load_image
+
+# HUD layout
+HEART_SIZE = 32
+HEART_SPACING = 5
+HUD_MARGIN = 10
+ICON_SIZE = 35
+ICON_FRAME_SIZE = 45  # Slightly larger to encompass the icon
+ICON_SPACING = 5
+XP_BAR_SCALE = 0.75
+XP_BAR_MARGIN = 31.5  # Pixels on both sides of the green bar
+
+class Hud:
+    """Retained-mode HUD layer: each widget is cached and re-rendered only when its inputs change."""
+    def __init__(self):
+        self.widgets = {}  # name -> (inputs key, surface, position)
+
+    def draw(self, screen, player):
+        """Draw every HUD widget for the given player."""
+        screen_size = screen.get_size()
+        self._draw_widget(screen, "health", (player.health, player.max_health, screen_size),
+                          lambda: self.render_health(player, screen_size))
+        self._draw_widget(screen, "score", (player.score, screen_size),
+                          lambda: self.render_score(player, screen_size))
+        self._draw_widget(screen, "xp", (player.current_xp, player.xp_to_next_level, player.level, screen_size),
+                          lambda: self.render_xp(player, screen_size))
+        self._draw_widget(screen, "icons", (self.icon_tray_key(player), screen_size),
+                          lambda: self.render_icon_tray(player, screen_size))
+
+    def _draw_widget(self, screen, name, key, render):
+        """Blit a widget, re-rendering it first if its inputs changed."""
+        cached = self.widgets.get(name)
+        if cached is None or cached[0] != key:
+            cached = (key,) + render()
+            self.widgets[name] = cached
+        _, surface, position = cached
+        if surface is not None:
+            screen.blit(surface, position)
+
+    def render_health(self, player, screen_size):
+        """Compose the row of hearts shown at the bottom-left corner."""
+        heart_images = {
+            name: load_image(f'./assets/images/hp/{name}.png', (HEART_SIZE, HEART_SIZE))
+            for name in ("empty", "low", "half", "high", "full")
+        }
+
+        # Calculate number of hearts based on max HP
+        max_hearts = max(1, player.max_health // 20)
+        surface = pygame.Surface((max_hearts * (HEART_SIZE + HEART_SPACING), HEART_SIZE), pygame.SRCALPHA)
+
+        current_health = player.health
+        x = 0
+        for i in range(max_hearts):
+            if current_health >= 20:
+                heart_image = heart_images["full"]
+            elif current_health >= 15:
+                heart_image = heart_images["high"]
+            elif current_health >= 10:
+                heart_image = heart_images["half"]
+            elif current_health >= 5:
+                heart_image = heart_images["low"]
+            else:
+                heart_image = heart_images["empty"]
+
+            surface.blit(heart_image, (x, 0))
+            current_health -= 20
+            x += HEART_SIZE + HEART_SPACING
+
+        return surface, (HUD_MARGIN, screen_size[1] - HUD_MARGIN - HEART_SIZE)
+
+    def render_score(self, player, screen_size):
+        """Render the score shown in the top-right corner."""
+        score_text = font_score.render(f"{player.score}", True, WHITE)
+        return score_text, (screen_size[0] - score_text.get_width() - 20, 25)
+
+    def render_xp(self, player, screen_size):
+        """Compose the XP bar shown at the top-center with the player's level in the middle."""
+        original_width, original_height = load_image('./assets/images/xp/xp-bar.png').get_size()
+        scaled_width = int(original_width * XP_BAR_SCALE)
+        scaled_height = int(original_height * XP_BAR_SCALE)
+        background = load_image('./assets/images/xp/xp-bar.png', (scaled_width, scaled_height))
+
+        surface = pygame.Surface((scaled_width, scaled_height), pygame.SRCALPHA)
+        surface.blit(background, (0, 0))
+
+        # Green bar proportional to the XP gathered toward the next level
+        max_green_width = scaled_width - 2 * XP_BAR_MARGIN
+        green_bar_width = int(max_green_width * (player.current_xp / player.xp_to_next_level))
+        green_bar_height = int(scaled_height * 0.475)
+        if green_bar_width > 0:
+            green_bar = pygame.transform.scale(load_image('./assets/images/xp/xp.png'), (green_bar_width, green_bar_height))
+            surface.blit(green_bar, (XP_BAR_MARGIN, (scaled_height - green_bar_height) // 2))
+
+        # Player's level centered on the bar
+        level_text = font_credit.render(str(player.level), True, WHITE)
+        surface.blit(level_text, (
+            (scaled_width - level_text.get_width()) // 2,
+            (scaled_height - level_text.get_height()) // 2
+        ))
+
+        return surface, ((screen_size[0] - scaled_width) // 2, 20)
+
+    def icon_tray_key(self, player):
+        """Everything the icon tray depends on, as a comparable tuple."""
+        abilities = tuple(
+            (type(ability).__name__, ability.active, getattr(ability, 'level', 1), getattr(ability, 'ready', True))
+            for ability in player.abilities
+        )
+        statuses = tuple((name, data.get("enemy")) for name, data in player.status_effects.items())
+        return abilities, tuple(player.stat_upgrades.items()), statuses
+
+    def icon_tray_entries(self, player):
+        """List the (icon, frame) pairs of the tray: abilities, then stat upgrades, then statuses."""
+        frame_size = (ICON_FRAME_SIZE, ICON_FRAME_SIZE)
+        icon_size = (ICON_SIZE, ICON_SIZE)
+        entries = []
+
+        # Active abilities, framed by their level
+        for ability in player.abilities:
+            if isinstance(ability, ShieldAbility) and not ability.ready:
+                continue  # Hidden while the shield recharges
+            if ability.active:
+                level = getattr(ability, 'level', 1)  # Assume level 1 if not defined
+                try:
+                    frame = load_image(f'./assets/images/abilities/abilities-frame-{min(level, 5)}.png', frame_size)
+                except FileNotFoundError:
+                    print(f"[DEBUG] Frame file not found for level {level}.")
+                    frame = None
+                entries.append((ability, frame))
+
+        # Stat upgrades, framed by their count
+        for stat, count in player.stat_upgrades.items():
+            if count > 6:
+                continue  # Skip displaying stats that have reached the maximum level
+            try:
+                icon = load_image(f'./assets/images/stats/{stat}.png', icon_size)
+                frame = load_image(f'./assets/images/stats/stats-frame-{count}.png', frame_size)
+                entries.append((icon, frame))
+            except FileNotFoundError:
+                print(f"[DEBUG] Missing icon or frame for stat {stat}, level {count}")
+
+        # Active status effects, with a special frame for boss debuffs
+        for status_name, status_data in player.status_effects.items():
+            try:
+                icon = load_image(f'./assets/images/status/{status_name}.png', icon_size)
+                frame_name = "debuff-frame-boss" if status_data.get("enemy") == "Boss" else "debuff-frame-2"
+                frame = load_image(f'./assets/images/status/{frame_name}.png', frame_size)
+                entries.append((icon, frame))
+            except FileNotFoundError:
+                print(f"[DEBUG] Status icon for {status_name} not found.")
+
+        return entries
+
+    def render_icon_tray(self, player, screen_size):
+        """Compose the icon tray, laid out right to left from the bottom-right corner."""
+        entries = self.icon_tray_entries(player)
+        if not entries:
+            return None, (0, 0)
+
+        # Lay out the slots in screen space, wrapping to the row above when full
+        screen_width, screen_height = screen_size
+        x = screen_width - ICON_FRAME_SIZE - HUD_MARGIN
+        y = screen_height - ICON_FRAME_SIZE - HUD_MARGIN
+        slots = []
+        for entry in entries:
+            slots.append((entry, x, y))
+            x -= ICON_FRAME_SIZE + ICON_SPACING  # Move left
+            if x - ICON_FRAME_SIZE < HUD_MARGIN:  # If there's no more space in the row
+                x = screen_width - ICON_FRAME_SIZE - HUD_MARGIN  # Reset to the right edge
+                y -= ICON_FRAME_SIZE + ICON_SPACING  # Move upward
+
+        # Compose the slots onto a surface covering just their bounding box
+        left = min(slot_x for _, slot_x, _ in slots)
+        top = min(slot_y for _, _, slot_y in slots)
+        right = max(slot_x for _, slot_x, _ in slots) + ICON_FRAME_SIZE
+        bottom = max(slot_y for _, _, slot_y in slots) + ICON_FRAME_SIZE
+        surface = pygame.Surface((right - left, bottom - top), pygame.SRCALPHA)
+
+        inset = (ICON_FRAME_SIZE - ICON_SIZE) // 2
+        for (icon, frame), slot_x, slot_y in slots:
+            local_x, local_y = slot_x - left, slot_y - top
+            if isinstance(icon, Ability):
+                icon.draw_icon(surface, local_x + inset, local_y + inset, ICON_SIZE)
+            else:
+                surface.blit(icon, (local_x + inset, local_y + inset))
+            if frame is not None:
+                surface.blit(frame, (local_x, local_y))
+
+        return surface, (left, top)
@@ -3,32 +3,76 @@ import pygame
 pygame.init()
 pygame.mixer.init()
 
+import argparse
+import os
 import random
 import sys
+import time
 from settings import *
 from player import Player
 from enemy_manager import EnemyManager
 from enemies.__init__ import *
 from abilities.__init__ import *
 from projectile import *
-from xp import draw_xp_drops, xp_drops
+from xp import collect_xp_drops, draw_xp_drops, xp_drops
 from menu import Menu
+from hud import Hud
+from controls import KeyboardMouseInput
+from game_clock import game_clock, TICK_RATE, TICK_MS, MAX_FRAME_MS
+from replay import ReplayRecorder, RecordingInput, run_summary
+from frame_timer import frame_timer
+from perf_overlay import PerfOverlay
+from tracer import tracer
+from profiler import profile_capture
+from hitch_detector import hitch_detector
+from background import TiledBackground
+from world import world
+from dot_engine import dot_engine
+import rng
 
 # Set up the display
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 
+# World background, cut into tiles in the display format now that the display exists
+world.background = TiledBackground(background_image)
+
 # Initialize the menu
 menu = Menu(screen)
 
+# Heads-up display (hearts, XP bar, score and icon tray)
+hud = Hud()
+
+# Performance overlay, toggled with F3
+perf_overlay = PerfOverlay()
+
+tracer.enabled = TRACE_ENABLED
+hitch_detector.enabled = HITCH_BUDGET_MS is not None
+hitch_detector.budget_ms = HITCH_BUDGET_MS
+game_clock.time_scale = TIME_SCALE
+
 # Globals for the current player and enemy manager
 current_player = None
 current_enemy_manager = None
-
-def reset_game(achievements=None):
-    """Reset the game state, including the player, enemies, projectiles, and abilities."""
-    global current_player, current_enemy_manager
-    projectiles.clear()
+current_skills = {}  # Skills the current run started with
+current_world_mode = WORLD_MODE  # 'arena' or 'endless', see world.py
+profile_next_run = 0  # Frames to profile from the start of the next run (--profile)
+
+# Run being recorded to REPLAY_PATH, as (recorder, player, enemy_manager)
+active_recording = None
+
+def reset_game(achievements=None, seeds=None, skills=None, world_mode=None):
+    """Reset the game state, including the player, enemies, projectiles, and abilities.
+
+    `seeds` (a run seed or the seed of every random stream, see rng.seed_streams),
+    `skills` and `world_mode` override the fresh seeds, the saved skills and
+    WORLD_MODE, so a recorded run can be set up again exactly.
+    """
+    global current_player, current_enemy_manager, current_skills, current_world_mode
+    projectile_store.clear()
     xp_drops.clear()
+    game_clock.reset()  # Every run starts at simulated time 0
+    dot_engine.clear()
+    rng.seed_streams(seeds)
 
     settings = menu.load_settings()
     if achievements is None:
@@ -36,41 +80,210 @@ def reset_game(achievements=None):
 
     # Reinitialize the player and enemy manager
     current_player = Player()
-    skills = settings.get("skills", {})
+    if skills is None:
+        skills = settings.get("skills", {})
+    current_skills = skills
     current_player.initialize_abilities(skills)
     current_player.apply_skill_upgrades(skills)
     current_player.apply_stat_upgrades(skills)
 
     current_enemy_manager = EnemyManager()
-    current_enemy_manager.enemies.clear()
+
+    current_world_mode = world_mode or WORLD_MODE
+    world.reset(endless=current_world_mode == 'endless')
+    world.update(current_player, current_enemy_manager)  # Load the chunks around the start
 
     return current_player, current_enemy_manager, achievements
 
-def get_camera_offset(player):
+def get_camera_offset(player, alpha=1.0):
     screen_width = pygame.display.get_surface().get_width()
     screen_height = pygame.display.get_surface().get_height()
 
-    offset_x = max(0, min(player.x - screen_width // 2, MAP_WIDTH - screen_width))
-    offset_y = max(0, min(player.y - screen_height // 2, MAP_HEIGHT - screen_height))
+    # Follow the interpolated player so the camera moves as smoothly as the sprites
+    player_x, player_y = player.get_draw_position(alpha)
+    return world.camera_offset(player_x, player_y, screen_width, screen_height)
+
+def get_view_rect(camera_x, camera_y):
+    """Map area worth drawing: the visible window plus CULL_MARGIN on every side."""
+    screen_width, screen_height = pygame.display.get_surface().get_size()
+    return pygame.Rect(camera_x - CULL_MARGIN, camera_y - CULL_MARGIN,
+                       screen_width + 2 * CULL_MARGIN, screen_height + 2 * CULL_MARGIN)
+
+def update_world(player, enemy_manager, achievements, controls, save_settings):
+    """Advance the game simulation by one tick. Returns True if the player died."""
+    camera_x, camera_y = get_camera_offset(player)
+
+    # Player movement and shooting
+    player.move(controls)
+    world.update(player, enemy_manager)
+    if game_clock.get_ticks() - player.last_shot_time > player.fire_rate:
+        fire_projectile(player, camera_x, camera_y, controls.aim_x, controls.aim_y)
+        player.last_shot_time = game_clock.get_ticks()
+    frame_timer.lap('input')
+
+    # Spawn enemies and boss behaviors
+    enemy_manager.spawn_timer += 1
+    if enemy_manager.spawn_timer >= enemy_manager.spawn_interval:
+        enemy_manager.spawn_enemy(player)
+        enemy_manager.spawn_timer = 0
+    enemy_manager.director.update(enemy_manager)
+    frame_timer.lap('spawn')
+
+    enemy_manager.update_enemies(player.x, player.y)
+    frame_timer.lap('enemies')
+
+    move_projectiles()
+    frame_timer.lap('projectiles')
+
+    # Burn and poison damage due this tick; what it kills is defeated like any other kill
+    for enemy in dot_engine.update():
+        enemy_manager.handle_enemy_defeat(enemy, player, xp_drops, achievements, save_settings)
+    frame_timer.lap('enemies')
+
+    # Enemy projectile and player collision handling. Every projectile that hits
+    # the player is spent, blocked or not.
+    hits = projectile_store.hits(ENEMY_TEAM, player.x, player.y, player.x + player.size, player.y + player.size)
+    for slot in hits.tolist():
+        # Let abilities (the shield) block the projectile
+        if player.block_hit():
+            block_hit_sound.play()
+        else:  # Not blocked, proceed with damage logic
+            # Check for invincibility
+            current_time = game_clock.get_ticks()
+            if current_time - player.last_damage_time < player.invincibility_time * 1000:
+                continue  # The projectile is removed without applying damage
+
+            # Apply damage to the player
+            player.health -= projectile_store.damage.item(slot)
+            player.last_damage_time = current_time  # Update the last damage time for invincibility
+            hurt_sound.play()
+
+            player.apply_status(
+                "burn", 
+                3, 
+                0.5, 
+                5, 
+                "Boss"
+            )  # Apply burn status to the player
+
+            # Check if the player's health has reached 0 or below
+            if player.health <= 0:
+                return True
+    projectile_store.discard(hits)
+
+    frame_timer.lap('projectiles')
 
-    return offset_x, offset_y
+    # Handle collisions
+    enemy_manager.handle_projectile_collisions(projectile_store, player, xp_drops, achievements, save_settings)
+    for enemy in enemy_manager.defeated_enemies():
+        enemy_manager.handle_enemy_defeat(enemy, player, xp_drops, achievements, save_settings)
+
+    # Handle player collisions with enemies
+    if enemy_manager.handle_player_collisions(player):
+        # Check if the player is dead
+        if player.health <= 0:
+            return True
+
+    collect_xp_drops(player)
+    frame_timer.lap('collisions')
+
+    # Ability effects; statuses deal their damage from the game clock
+    if player.health <= 0:
+        return True
+    player.update_abilities_effects()
+    frame_timer.lap('effects')
+
+    game_clock.advance()
+    return False
+
+def draw_world(screen, player, enemy_manager, alpha=1.0):
+    """Draw the map, every entity and the HUD.
+
+    Moving entities are drawn `alpha` of the way from their previous tick
+    position to their current one, so rendering can run at any rate.
+    """
+    camera_x, camera_y = get_camera_offset(player, alpha)
+    view = get_view_rect(camera_x, camera_y)  # Anything outside it is skipped
+
+    # Draw the background
+    world.draw_background(screen, camera_x, camera_y)
+
+    # Draw game elements
+    player.draw_with_offset(screen, camera_x, camera_y, alpha)
+    draw_projectiles(screen, camera_x, camera_y, alpha, view, PLAYER_TEAM)
+    enemy_manager.draw_enemies(screen, camera_x, camera_y, player, alpha, view)
+    draw_projectiles(screen, camera_x, camera_y, alpha, view, ENEMY_TEAM)
+    draw_xp_drops(screen, camera_x, camera_y, view)
+    frame_timer.lap('draw')
+
+    hud.draw(screen, player)
+    frame_timer.lap('hud')
+
+def start_profile(frames, player, enemy_manager):
+    """Profile the next `frames` frames, tagging the reports with the current run state."""
+    tags = {"level": player.level, "enemies": len(enemy_manager.enemies)}
+    if rng.run_seed is not None:
+        tags["seed"] = rng.run_seed
+    profile_capture.start(frames, tags)
+
+def count_entities(player, enemy_manager):
+    """Live entity counts shown by the performance overlay."""
+    return {
+        "enemies": len(enemy_manager.enemies),
+        "projectiles": projectile_store.count_team(PLAYER_TEAM),
+        "boss shots": projectile_store.count_team(ENEMY_TEAM),
+        "xp drops": len(xp_drops),
+        "statuses": len(player.status_effects),
+        "enemy DoTs": len(dot_engine.active),
+        "chunks": len(world.chunks),
+    }
+
+def start_recording(player, enemy_manager, controls):
+    """Record the run to REPLAY_PATH and return the recording input wrapper."""
+    global active_recording
+    os.makedirs(os.path.dirname(REPLAY_PATH), exist_ok=True)
+    recorder = ReplayRecorder(REPLAY_PATH)
+    recorder.start(rng.stream_seeds, current_skills, screen.get_size(), current_world_mode)
+    active_recording = (recorder, player, enemy_manager)
+    return RecordingInput(controls, recorder)
+
+def stop_recording():
+    """Finish the replay of the run being recorded, if any."""
+    global active_recording
+    if active_recording is not None:
+        recorder, player, enemy_manager = active_recording
+        recorder.close(run_summary(player, enemy_manager))
+        active_recording = None
 
 def game_loop(player, enemy_manager, achievements):
     clock = pygame.time.Clock()
-    boss_projectiles.clear()
-    frame_count = 0
+    controls = KeyboardMouseInput()
+
+    # Menus can start a new run from inside this one, so close any earlier recording first
+    stop_recording()
+    if RECORD_REPLAYS:
+        controls = start_recording(player, enemy_manager, controls)
 
     # Music management
     main_menu_music.stop()
     game_music.play(-1)
 
+    global profile_next_run
+    if profile_next_run:
+        start_profile(profile_next_run, player, enemy_manager)
+        profile_next_run = 0
+
     running = True
+    accumulator = 0  # Real time (ms) not yet simulated
+    frame_timer.restart_frame()
+    hitch_detector.clear()
 
     while running:
-        camera_x, camera_y = get_camera_offset(player)
-
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                stop_recording()
+                tracer.flush()
+                profile_capture.stop()
                 pygame.quit()
                 sys.exit()
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
@@ -78,154 +291,140 @@ def game_loop(player, enemy_manager, achievements):
                 return_to_menu = menu.pause_menu(reset_game=reset_game, game_loop=game_loop, achievements=achievements)
                 if return_to_menu:
                     # Return to the main menu
+                    stop_recording()
+                    tracer.flush()
+                    profile_capture.stop()
                     return
-
-        # Player movement and shooting
-        player.move()
-        if pygame.time.get_ticks() - player.last_shot_time > player.fire_rate:
-            fire_projectile(player, camera_x, camera_y)
-            player.last_shot_time = pygame.time.get_ticks()
-
-        # Spawn enemies and boss behaviors
-        frame_count += 1
-        if frame_count >= enemy_manager.spawn_interval:
-            enemy_manager.spawn_enemy(player.level)
-            frame_count = 0
-
-        enemy_manager.update_enemies(player.x, player.y, player, screen, camera_x, camera_y)
-
-        move_projectiles()
-        move_boss_projectiles()
-
-        # Handle enemy interactionsa
-        for enemy in enemy_manager.enemies:
-            # Apply active abilities
-            for ability in player.abilities:
-                if ability.active:
-                    if isinstance(ability, ShieldAbility):
-                        ability.update() 
-                    elif isinstance(ability, BurningAbility):
-                        ability.update_burn(enemy)
-                    elif isinstance(ability, HealingAbility):
-                        ability.heal(player)
-                    elif isinstance(ability, InvincibilityAbility):
-                        ability.apply_invincibility(player)
-                    elif isinstance(ability, PoisonAbility):
-                        ability.update_poison(enemy)
-
-            # Boss-specific behavior
-            if isinstance(enemy, Boss1Enemy):
-                enemy.shoot_at_player(player)
-
-        # Projectile and player collision handling
-        for projectile in boss_projectiles[:]:
-            projectile['x'] += projectile['dx'] * projectile['speed']
-            projectile['y'] += projectile['dy'] * projectile['speed']
-
-            projectile_rect = pygame.Rect(
-                projectile['x'], 
-                projectile['y'], 
-                boss_projectile_frames[0].get_width(),
-                boss_projectile_frames[0].get_height()
-            )
-            player_rect = pygame.Rect(player.x, player.y, player.size, player.size)
-
-            # Check for collision with the player by boss projectiles
-            if player_rect.colliderect(projectile_rect):
-                # Check for active ShieldAbility
-                for ability in player.abilities:
-                    if isinstance(ability, ShieldAbility) and ability.block():
-                        block_hit_sound.play()
-                        boss_projectiles.remove(projectile)  # Remove the projectile since it was blocked
-                        break  # Exit the loop over `boss_projectiles` since the shield blocked the projectile
-                else:  # Shield didn't block, proceed with damage logic
-                    # Check for invincibility
-                    current_time = pygame.time.get_ticks()
-                    if current_time - player.last_damage_time < player.invincibility_time * 1000:
-                        boss_projectiles.remove(projectile)  # Remove the projectile without applying damage
-                        continue  # Skip further damage logic
-
-                    # Apply damage to the player
-                    player.health -= projectile['damage']
-                    player.last_damage_time = current_time  # Update the last damage time for invincibility
-                    hurt_sound.play()
-
-                    player.apply_status(
-                        "burn", 
-                        3, 
-                        0.5, 
-                        5, 
-                        "Boss"
-                    )  # Apply burn status to the player
-
-                    # Check if the player's health has reached 0 or below
-                    if player.health <= 0:
-                        death_sound.play()
-                        new_player, new_enemy_manager, achievements = reset_game(achievements=achievements)
-                        menu.game_over_screen(player.score, new_enemy_manager, reset_game, game_loop, achievements)
-                        return  # Exit the game loop
-
-                # Remove the projectile
-                if projectile in boss_projectiles:
-                    boss_projectiles.remove(projectile)
-
-            # Remove the projectile if it goes out of bounds
-            if (projectile['x'] < 0 or projectile['x'] > MAP_WIDTH or
-                    projectile['y'] < 0 or projectile['y'] > MAP_HEIGHT):
-                if projectile in boss_projectiles:
-                    boss_projectiles.remove(projectile)
-
-        # Handle collisions
-        enemy_manager.handle_projectile_collisions(projectiles, player, xp_drops, achievements, menu.save_settings)
-        for enemy in enemy_manager.enemies[:]:
-            if enemy.is_dead():
-                achievements = enemy_manager.handle_enemy_defeat(enemy, player, xp_drops, achievements, menu.save_settings)
-
-        # Handle player collisions with enemies
-        if enemy_manager.handle_player_collisions(player):
-            # Check if the player is dead
-            if player.health <= 0:
+                clock.tick()  # Time spent paused is not simulated
+                frame_timer.restart_frame()
+                hitch_detector.clear()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                perf_overlay.toggle()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                tracer.flush()  # Save the timeline so far
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                # Start a capture of PROFILE_FRAMES frames, or stop the running one early
+                if profile_capture.active:
+                    profile_capture.stop()
+                else:
+                    start_profile(PROFILE_FRAMES, player, enemy_manager)
+        frame_timer.lap('input')
+
+        # Run as many fixed ticks as the real time elapsed calls for. A long stall
+        # is clamped so the game slows down instead of trying to catch up forever.
+        accumulator += min(clock.tick(MAX_FPS), MAX_FRAME_MS) * game_clock.time_scale
+        frame_timer.skip()  # Waiting for the frame cap is idle time
+        while accumulator >= TICK_MS and not player.level_up_pending:
+            camera_x, camera_y = get_camera_offset(player)
+            tick_input = controls.poll(player, enemy_manager, camera_x, camera_y)
+            frame_timer.lap('input')
+            if update_world(player, enemy_manager, achievements, tick_input, menu.save_settings):
                 death_sound.play()
-                new_player, new_enemy_manager, achievements = reset_game()
+                stop_recording()
+                tracer.flush()
+                profile_capture.stop()
+                new_player, new_enemy_manager, achievements = reset_game(achievements=achievements)
                 menu.game_over_screen(player.score, new_enemy_manager, reset_game, game_loop, achievements)
-                return
-
-        # Calculate background position
-        background_x = -camera_x
-        background_y = -camera_y
-
-        # Draw the background
-        screen.blit(background_image, (background_x, background_y))
-
-        # Draw game elements
-        player.draw_with_offset(screen, camera_x, camera_y)
-        draw_projectiles(screen, camera_x, camera_y)
-        enemy_manager.draw_enemies(screen, camera_x, camera_y, player)
-        draw_boss_projectiles(screen, camera_x, camera_y)
-        draw_xp_drops(screen, player, camera_x, camera_y)
+                return  # Exit the game loop
+            accumulator -= TICK_MS
 
         if player.level_up_pending:
-            menu.level_up_menu(player, screen)
+            draw_world(screen, player, enemy_manager)
+            choice = menu.level_up_menu(player, screen)
+            if active_recording is not None:
+                active_recording[0].record_level_up(choice)
             player.level_up_pending = False
+            accumulator = 0
+            clock.tick()  # Time spent in the menu is not simulated
+            frame_timer.restart_frame()
+            # The level-up events are kept: the new upgrade's first-use costs land in the next frame
             continue
 
-        player.draw_health(screen)
-        player.draw_score(screen)
-        player.draw_xp(screen)
+        # Render between the last two ticks, however far into the next one we are
+        draw_world(screen, player, enemy_manager, accumulator / TICK_MS)
+        perf_overlay.draw(screen, frame_timer, lambda: count_entities(player, enemy_manager))
+        frame_timer.lap('overlay')
+        pygame.display.flip()
+        frame_timer.lap('flip')
+        frame_timer.end_frame()
+        hitch_detector.check(frame_timer, lambda: count_entities(player, enemy_manager))
+        profile_capture.frame_done()
+
+def run_simulation(controls, max_ticks, render=False, realtime=False, seeds=None, skills=None,
+                   resolution=None, world_mode=None, recorder=None, profile_start=None,
+                   profile_frames=PROFILE_FRAMES):
+    """Run the game without menus, audio pacing or a frame cap.
+
+    The simulation stops when the player dies or after `max_ticks` ticks and
+    returns a summary of the run. Level-up choices are delegated to `controls`.
+    With `realtime` every tick is drawn and paced at TICK_RATE. `seeds`, `skills`,
+    `resolution` and `world_mode` set the run up (see reset_game); `recorder`
+    records it.
+    With `profile_start`, `profile_frames` ticks are profiled from that tick on.
+    """
+    player, enemy_manager, achievements = reset_game(seeds=seeds, skills=skills, world_mode=world_mode)
+    if resolution is not None:
+        pygame.display.set_mode(resolution)  # Aim input is in screen coordinates
+    if recorder is not None:
+        recorder.start(rng.stream_seeds, current_skills, screen.get_size(), current_world_mode)
+        controls = RecordingInput(controls, recorder)
+    save_settings = lambda **kwargs: None  # Simulated runs never touch utils.json
+    died = False
+    clock = pygame.time.Clock()
+    started = time.perf_counter()
+    frame_timer.restart_frame()
+    hitch_detector.clear()
 
-        # Status and ability iconsd
-        player.update_status_effects()
-        if player.health <= 0:
-            death_sound.play()
-            new_player, new_enemy_manager, achievements = reset_game()
-            menu.game_over_screen(player.score, new_enemy_manager, reset_game, game_loop, achievements)
-            return
-        player.update_abilities_effects()
-        player.draw_status_abilities_icons(screen)
+    for tick in range(max_ticks):
+        if tick == profile_start:
+            start_profile(profile_frames, player, enemy_manager)
+        pygame.event.pump()
 
-        pygame.display.flip()
-        clock.tick(60)
+        camera_x, camera_y = get_camera_offset(player)
+        tick_input = controls.poll(player, enemy_manager, camera_x, camera_y)
+        if update_world(player, enemy_manager, achievements, tick_input, save_settings):
+            died = True
+            break
+
+        if player.level_up_pending:
+            options = menu.roll_level_up_options()
+            player.apply_upgrade(options[controls.choose_upgrade(player, options)]["upgrade"])
+            player.last_shot_time = game_clock.get_ticks()
+            player.level_up_pending = False
+
+        if render or realtime:
+            draw_world(screen, player, enemy_manager)
+            pygame.display.flip()
+            frame_timer.lap('flip')
+        if realtime:
+            clock.tick(TICK_RATE * game_clock.time_scale)
+        frame_timer.end_frame()
+        hitch_detector.check(frame_timer, lambda: count_entities(player, enemy_manager))
+        profile_capture.frame_done()
+
+    profile_capture.stop()  # The run may end before the capture does
+    if recorder is not None:
+        recorder.close(run_summary(player, enemy_manager))
+
+    return {
+        "ticks": game_clock.ticks,
+        "simulated_seconds": round(game_clock.time(), 2),
+        "wall_seconds": round(time.perf_counter() - started, 2),
+        "died": died,
+        "level": player.level,
+        "score": player.score,
+        "health": player.health,
+        "enemies": len(enemy_manager.enemies),
+        "projectiles": projectile_store.count_team(PLAYER_TEAM),
+        "boss_projectiles": projectile_store.count_team(ENEMY_TEAM),
+        "xp_drops": len(xp_drops),
+    }
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCG Vampire Survivors")
+    parser.add_argument('--profile', type=int, default=0, metavar='FRAMES',
+                        help="profile the first FRAMES frames of the first run (reports in ./profiles)")
+    profile_next_run = parser.parse_args().profile
+
     current_player, current_enemy_manager, achievements = reset_game()
     menu.main_menu(current_player, current_enemy_manager, reset_game, game_loop, achievements)
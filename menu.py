@@ -2,10 +2,23 @@ import json
 import os
 import pygame
 import sys
-import random
 from player import Player
 import player
 from settings import *
+from game_clock import game_clock
+from rng import streams
+from tracer import traced
+from hitch_detector import hitch_detector
+
+# Every upgrade the level-up menu can offer
+LEVEL_UP_UPGRADES = [
+    {"text": "Increase Fire Rate by 20%", "upgrade": "fire_rate"},
+    {"text": "Increase Damage by 30%", "upgrade": "damage"},
+    {"text": "Restore 40 HP", "upgrade": "health"},
+    {"text": "Increase Max Health by 20", "upgrade": "max_health"},
+    {"text": "Increase Speed by 13%", "upgrade": "speed"},
+    {"text": "Increase Crit Chance by 5%", "upgrade": "crit_chance"}
+]
 
 class Menu:
     def __init__(self, screen):
@@ -18,8 +31,10 @@ class Menu:
             (1366, 768), (1280, 720), (1024, 576)
         ]
 
+    @traced('load_menu_background', 'assets')
     def load_menu_background(self):
         """Load and scale the menu background to the current resolution."""
+        hitch_detector.note('load_menu_background')
         try:
             # Load the background image
             menu_background = pygame.image.load("./assets/images/background/gameart-cover.jpg")
@@ -31,6 +46,7 @@ class Menu:
             print("Error loading menu background image:", e)
             return None
 
+    @traced('load_settings', 'io')
     def load_settings(self):
         """Load the settings from the utils.json file, or create defaults if the file is empty or missing."""
         default_settings = {
@@ -225,8 +241,10 @@ class Menu:
 
         return settings
 
+    @traced('save_settings', 'io')
     def save_settings(self, achievements=None):
         """Save the settings to the utils.json file."""
+        hitch_detector.note('save_settings', file=self.settings_file)
         try:
             with open(self.settings_file, "r+") as f:
                 try:
@@ -263,6 +281,7 @@ class Menu:
             with open(self.settings_file, "w") as f:
                 json.dump({"high_score": score}, f, indent=4)
 
+    @traced('Menu.main_menu', 'menu')
     def main_menu(self, player, enemy_manager, reset_game, game_loop, achievements):
         """Displays the main menu."""
 
@@ -379,9 +398,14 @@ class Menu:
 
             pygame.display.flip()
 
-        reset_game(achievements=achievements)
+        self.start_game(reset_game, game_loop, achievements)
+
+    def start_game(self, reset_game, game_loop, achievements):
+        """Start a new run with the player and enemies reset_game() builds for it."""
+        player, enemy_manager, achievements = reset_game(achievements=achievements)
         game_loop(player, enemy_manager, achievements)
 
+    @traced('Menu.settings_menu', 'menu')
     def settings_menu(self):
         """Displays the settings menu."""
         running = True
@@ -574,6 +598,7 @@ class Menu:
 
         return skill_points_earned
 
+    @traced('Menu.pause_menu', 'menu')
     def pause_menu(self, reset_game, game_loop, achievements):
         """Displays the pause menu."""
         paused = True
@@ -648,6 +673,7 @@ class Menu:
 
         return False  # Continue the game
 
+    @traced('Menu.game_over_screen', 'menu')
     def game_over_screen(self, score, enemy_manager, reset_game, game_loop, achievements):
         """Display the Game Over screen and save achievements."""
         
@@ -753,25 +779,21 @@ class Menu:
 
             pygame.display.flip()
 
+    def roll_level_up_options(self):
+        """Randomly select the 3 upgrades offered on level up."""
+        return streams['level_up'].sample(LEVEL_UP_UPGRADES, 3)
+
+    @traced('Menu.level_up_menu', 'menu')
     def level_up_menu(self, player, screen):
-        """Displays the level-up menu and lets the player choose an upgrade."""
+        """Displays the level-up menu, applies the chosen upgrade and returns its index."""
         running = True
+        chosen = None
 
         # Play the level-up sound
         level_up_sound.play()
 
-        # Define all possible upgrades
-        all_upgrades = [
-            {"text": "Increase Fire Rate by 20%", "upgrade": "fire_rate"},
-            {"text": "Increase Damage by 30%", "upgrade": "damage"},
-            {"text": "Restore 40 HP", "upgrade": "health"},
-            {"text": "Increase Max Health by 20", "upgrade": "max_health"},
-            {"text": "Increase Speed by 13%", "upgrade": "speed"},
-            {"text": "Increase Crit Chance by 5%", "upgrade": "crit_chance"}
-        ]
-
         # Randomly select 3 upgrades
-        selected_upgrades = random.sample(all_upgrades, 3)
+        selected_upgrades = self.roll_level_up_options()
 
         hovered_button = None  # To track which button is hovered
 
@@ -835,12 +857,14 @@ class Menu:
                         if rect.collidepoint(mouse_x, mouse_y):  # Check if click is inside button rect
                             click_sound.play()  # Play click sound
                             player.apply_upgrade(selected_upgrades[i]["upgrade"])
+                            chosen = i
                             running = False  # Exit menu
 
             pygame.display.flip()
 
         # Update last_shot_time to avoid firing immediately after exiting the menu
-        player.last_shot_time = pygame.time.get_ticks()
+        player.last_shot_time = game_clock.get_ticks()
+        return chosen
 
     def can_upgrade(self, skill_name):
         """Check if a skill can be upgraded."""
@@ -887,6 +911,7 @@ class Menu:
         return True
 
 
+    @traced('Menu.skill_tree_menu', 'menu')
     def skill_tree_menu(self, player, achievements=None):
         """Display the skill tree and handle interactions."""
         running = True
@@ -1153,7 +1178,7 @@ class Menu:
                         main_menu_music.play(-1)
                         player.apply_skill_upgrades(self.settings["skills"])
                         player.apply_stat_upgrades(self.settings["skills"])
-                        player.abilities = []
+                        player.clear_abilities()
                         player.initialize_abilities(self.settings["skills"])
                         running = False
 
@@ -0,0 +1,81 @@
+import pygame
+from settings import *
+from frame_timer import PHASES, HISTORY_FRAMES
+
+OVERLAY_REFRESH_MS = 250  # How often the text is re-rendered
+OVERLAY_MARGIN = 10
+LINE_HEIGHT = 18
+GRAPH_HEIGHT = 80
+GRAPH_MAX_MS = 50  # Frame time at the top of the graph
+FRAME_BUDGET_MS = 1000 / 60
+
+class PerfOverlay:
+    """Toggleable (F3) overlay with frame timings and entity counts, refreshed a few times per second."""
+    def __init__(self):
+        self.visible = False
+        self.text_surface = None
+        self.last_refresh = 0
+        self.frames_seen = 0  # Frame history length at the last refresh
+        self.graph = pygame.Surface((HISTORY_FRAMES, GRAPH_HEIGHT), pygame.SRCALPHA)
+        self.graph.fill((0, 0, 0, 160))
+        self.budget_y = GRAPH_HEIGHT - int(FRAME_BUDGET_MS * GRAPH_HEIGHT / GRAPH_MAX_MS)
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def add_frame(self, frame_ms):
+        """Scroll the graph and plot the newest frame time as a column on the right."""
+        self.graph.scroll(-1, 0)
+        self.graph.fill((0, 0, 0, 160), (HISTORY_FRAMES - 1, 0, 1, GRAPH_HEIGHT))
+        height = min(GRAPH_HEIGHT, int(frame_ms * GRAPH_HEIGHT / GRAPH_MAX_MS))
+        color = GREEN if frame_ms <= FRAME_BUDGET_MS else YELLOW if frame_ms <= 2 * FRAME_BUDGET_MS else RED
+        self.graph.fill(color, (HISTORY_FRAMES - 1, GRAPH_HEIGHT - height, 1, height))
+        self.graph.set_at((HISTORY_FRAMES - 1, self.budget_y), WHITE)  # 16.6 ms budget line
+
+    def render_text(self, timer, counts):
+        """Compose the text block from the frames recorded since the last refresh."""
+        recent = list(timer.phase_history)[-max(1, min(self.frames_seen, HISTORY_FRAMES)):]
+        frame_times = list(timer.frame_times)[-len(recent):]
+        average_ms = sum(frame_times) / len(frame_times) if frame_times else 0
+        worst_ms = max(frame_times) if frame_times else 0
+
+        # (label, value) rows, drawn as two aligned columns
+        rows = [
+            ("FPS", f"{1000 / average_ms if average_ms else 0:.1f}"),
+            ("frame", f"{average_ms:.2f} ms"),
+            ("worst", f"{worst_ms:.2f} ms"),
+            ("", ""),
+        ]
+        for phase in PHASES:
+            phase_ms = sum(frame[phase] for frame in recent) / len(recent) if recent else 0
+            rows.append((phase, f"{phase_ms:.2f} ms"))
+        rows.append(("", ""))
+        rows.extend((name, str(count)) for name, count in counts.items())
+
+        surface = pygame.Surface((HISTORY_FRAMES + 2 * OVERLAY_MARGIN,
+                                  len(rows) * LINE_HEIGHT + 2 * OVERLAY_MARGIN), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 160))
+        value_right = surface.get_width() - OVERLAY_MARGIN
+        for i, (label, value) in enumerate(rows):
+            y = OVERLAY_MARGIN + i * LINE_HEIGHT
+            surface.blit(font_overlay.render(label, True, WHITE), (OVERLAY_MARGIN, y))
+            value_surface = font_overlay.render(value, True, WHITE)
+            surface.blit(value_surface, (value_right - value_surface.get_width(), y))
+        return surface
+
+    def draw(self, screen, timer, count_entities):
+        """Draw the overlay; `count_entities` returns the live entity counts when the text is refreshed."""
+        if timer.frame_times:
+            self.add_frame(timer.frame_times[-1])
+        self.frames_seen += 1
+        if not self.visible:
+            return
+
+        now = pygame.time.get_ticks()
+        if self.text_surface is None or now - self.last_refresh >= OVERLAY_REFRESH_MS:
+            self.text_surface = self.render_text(timer, count_entities())
+            self.last_refresh = now
+            self.frames_seen = 0
+
+        screen.blit(self.text_surface, (OVERLAY_MARGIN, OVERLAY_MARGIN))
+        screen.blit(self.graph, (2 * OVERLAY_MARGIN, OVERLAY_MARGIN * 2 + self.text_surface.get_height()))
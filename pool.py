@@ -0,0 +1,23 @@
+class Pool:
+    """Free list of reusable objects; acquired objects keep old values, so callers set every field."""
+    def __init__(self, factory, limit=1024):
+        self.factory = factory
+        self.limit = limit
+        self.free = []
+
+    def acquire(self):
+        if self.free:
+            return self.free.pop()
+        return self.factory()
+
+    def release(self, item):
+        if len(self.free) < self.limit:
+            self.free.append(item)
+
+def swap_remove(items, index):
+    """Remove items[index] in O(1) by moving the last item into its place. Returns the removed item."""
+    item = items[index]
+    last = items.pop()
+    if index < len(items):
+        items[index] = last
+    return item
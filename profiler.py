@@ -0,0 +1,115 @@
+import cProfile
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+PROFILE_DIR = './profiles'
+SAMPLE_INTERVAL = 0.001  # Seconds between stack samples
+
+class StackSampler:
+    """Samples the call stack of the game loop thread at a fixed interval, for flame graphs."""
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts = Counter()
+        self.thread_id = threading.get_ident()
+        self.use_signal = hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+        self.previous_handler = None
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def start(self):
+        if self.use_signal:
+            self.previous_handler = signal.signal(signal.SIGPROF, self.on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self.thread = threading.Thread(target=self.poll_thread, name="stack-sampler", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        if self.use_signal:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self.previous_handler)
+        else:
+            self.stop_event.set()
+            self.thread.join()
+
+    def on_signal(self, signum, frame):
+        self.record(frame)
+
+    def poll_thread(self):
+        while not self.stop_event.wait(self.interval):
+            self.record(sys._current_frames().get(self.thread_id))
+
+    def record(self, frame):
+        """Count one sample of the stack ending at `frame`."""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        if stack:
+            self.counts[';'.join(reversed(stack))] += 1
+
+class ProfileCapture:
+    """Profiles a number of frames of the game loop with cProfile and a stack sampler."""
+    def __init__(self):
+        self.profile = None
+        self.sampler = None
+        self.frames_left = 0
+        self.tags = {}
+
+    @property
+    def active(self):
+        return self.profile is not None
+
+    def start(self, frames, tags):
+        """Start profiling the next `frames` frames."""
+        if self.active:
+            return
+        self.frames_left = frames
+        self.tags = tags
+        self.sampler = StackSampler()
+        self.sampler.start()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        print(f"[PROFILE] Capturing {frames} frames ({self.describe_tags()})")
+
+    def frame_done(self):
+        """Count a finished frame, stopping the capture after the last one."""
+        if self.active:
+            self.frames_left -= 1
+            if self.frames_left <= 0:
+                return self.stop()
+        return None
+
+    def stop(self):
+        """Stop the capture and write its reports. Returns the report paths."""
+        if not self.active:
+            return None
+        self.profile.disable()
+        self.sampler.stop()
+
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        tag_text = '-'.join(f"{name}{value}" for name, value in self.tags.items())
+        base = os.path.join(PROFILE_DIR, f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{tag_text}")
+        pstats_path = base + '.pstats'
+        collapsed_path = base + '.collapsed.txt'
+
+        self.profile.dump_stats(pstats_path)
+        with open(collapsed_path, 'w') as f:
+            for stack, count in self.sampler.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+        self.profile = None
+        self.sampler = None
+        print(f"[PROFILE] Wrote {pstats_path} and {collapsed_path}")
+        return pstats_path, collapsed_path
+
+    def describe_tags(self):
+        return ', '.join(f"{name} {value}" for name, value in self.tags.items())
+
+# Shared capture used by the game loop (F5) and the --profile flags
+profile_capture = ProfileCapture()
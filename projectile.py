@@ -1,13 +1,25 @@
-import random
 import pygame
 import math
+import numpy as np
+from collections import OrderedDict
 from settings import *
+from game_clock import game_clock
+from rng import streams
+from hitch_detector import hitch_detector
+from world import world
 
 pygame.mixer.init()
 
-# List to store active projectiles
-projectiles = []
-boss_projectiles = []
+# Who fired a projectile; shots only collide with the other team
+PLAYER_TEAM = 0
+ENEMY_TEAM = 1
+
+# Sprite of a projectile, an index into projectile_frames
+NORMAL_SHOT = 0
+CRIT_SHOT = 1
+BOSS_SHOT = 2
+
+PLAYER_SHOT_SIZE = (10, 10)  # Hit box of player projectiles
 
 # Load projectile animations
 try:
@@ -29,112 +41,229 @@ except pygame.error as e:
     print(f"Error loading projectile frames: {e}")
     normal_projectile_frames, crit_projectile_frames, boss_projectile_frames = [], [], []
 
-def fire_projectile(player, camera_x, camera_y):
-    mouse_x, mouse_y = pygame.mouse.get_pos()
-    dx = mouse_x + camera_x - (player.x + player.size / 2)
-    dy = mouse_y + camera_y - (player.y + player.size / 2)
+# Rotated frame cache. Angles are snapped to one of ROTATION_BUCKETS directions so
+# each (frame set, frame index, direction) is rotated once instead of every frame.
+ROTATION_BUCKETS = 128
+ROTATION_CACHE_LIMIT = 1536  # Max rotated surfaces kept; least recently used are evicted
+_rotation_cache = OrderedDict()
+
+def quantize_angle(angle):
+    """Snap an angle in degrees to its rotation bucket."""
+    return round(angle * ROTATION_BUCKETS / 360) % ROTATION_BUCKETS
+
+def quantize_angles(angles):
+    """quantize_angle for an array of angles; rounds halves to even like round()."""
+    return np.round(np.asarray(angles) * ROTATION_BUCKETS / 360).astype(np.int64) % ROTATION_BUCKETS
+
+def get_rotated_frame(frames, frame_index, angle_bucket):
+    """Return a frame rotated to the given bucket, rotating it on first use."""
+    key = (id(frames), frame_index, angle_bucket)
+    rotated_frame = _rotation_cache.get(key)
+    if rotated_frame is None:
+        rotated_frame = pygame.transform.rotate(frames[frame_index], angle_bucket * 360 / ROTATION_BUCKETS)
+        _rotation_cache[key] = rotated_frame
+        hitch_detector.count_surfaces('rotate_frame')
+        if len(_rotation_cache) > ROTATION_CACHE_LIMIT:
+            _rotation_cache.popitem(last=False)
+    else:
+        _rotation_cache.move_to_end(key)
+    return rotated_frame
+
+# Frame sets by sprite
+projectile_frames = [normal_projectile_frames, crit_projectile_frames, boss_projectile_frames]
+FALLBACK_COLORS = [YELLOW, RED, RED]  # Drawn instead when a sprite's frames are missing
+
+class ProjectileStore:
+    """Structure-of-arrays storage for every projectile in play, player's and bosses' alike.
+
+    Slots stay in firing order: removals compact the arrays instead of swapping the last slot in.
+    """
+    FIELDS = {
+        'x': np.float64,
+        'y': np.float64,
+        'prev_x': np.float64,  # Position at the previous tick, for render interpolation
+        'prev_y': np.float64,
+        'dx': np.float64,  # Unit direction
+        'dy': np.float64,
+        'speed': np.float64,
+        'damage': np.float64,
+        'width': np.float64,  # Hit box, from the position
+        'height': np.float64,
+        'team': np.int8,
+        'sprite': np.int8,
+        'frame_index': np.int16,
+        'last_frame_time': np.int64,  # Game time of the last animation frame change
+        'angle_bucket': np.int16,  # Key into the rotated frame cache
+    }
+
+    def __init__(self, capacity=256):
+        self.count = 0  # Number of occupied slots (always the first `count`)
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Create (or grow) the backing arrays, keeping the occupied slots."""
+        old = getattr(self, 'x', None)
+        self.capacity = capacity
+        for name, dtype in self.FIELDS.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+
+    def add(self, x, y, dx, dy, speed, damage, team, sprite, width, height):
+        """Put a projectile leaving (x, y) in direction (dx, dy) in play."""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+
+        slot = self.count
+        self.x[slot] = self.prev_x[slot] = x
+        self.y[slot] = self.prev_y[slot] = y
+        self.dx[slot] = dx
+        self.dy[slot] = dy
+        self.speed[slot] = speed
+        self.damage[slot] = damage
+        self.width[slot] = width
+        self.height[slot] = height
+        self.team[slot] = team
+        self.sprite[slot] = sprite
+        self.frame_index[slot] = 0  # Start at the first frame
+        self.last_frame_time[slot] = game_clock.get_ticks()
+        # Negative dy because Pygame's y-axis is flipped
+        self.angle_bucket[slot] = quantize_angle(math.degrees(math.atan2(-dy, dx)))
+        self.count += 1
+
+    def add_many(self, xs, ys, dxs, dys, speed, damage, team, sprite, width, height):
+        """Put a whole volley in play at once; positions and directions are arrays, the rest is shared."""
+        count = len(xs)
+        needed = self.count + count
+        if needed > self.capacity:
+            capacity = self.capacity
+            while capacity < needed:
+                capacity *= 2
+            self._allocate(capacity)
+
+        start = self.count
+        volley = slice(start, needed)
+        self.x[volley] = self.prev_x[volley] = xs
+        self.y[volley] = self.prev_y[volley] = ys
+        self.dx[volley] = dxs
+        self.dy[volley] = dys
+        self.speed[volley] = speed
+        self.damage[volley] = damage
+        self.width[volley] = width
+        self.height[volley] = height
+        self.team[volley] = team
+        self.sprite[volley] = sprite
+        self.frame_index[volley] = 0
+        self.last_frame_time[volley] = game_clock.get_ticks()
+        angles = np.degrees(np.arctan2(-np.asarray(dys), dxs))
+        self.angle_bucket[volley] = quantize_angles(angles)
+        self.count = needed
+
+    def clear(self):
+        """Remove every projectile."""
+        self.count = 0
+
+    def count_team(self, team):
+        """Number of projectiles fired by `team`."""
+        return int(np.count_nonzero(self.team[:self.count] == team))
+
+    def keep(self, mask):
+        """Keep only the slots where `mask` is True, in their current order."""
+        kept = np.flatnonzero(mask)
+        if len(kept) == self.count:
+            return
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[:len(kept)] = array[kept]
+        self.count = len(kept)
+
+    def discard(self, slots):
+        """Remove the projectiles in `slots`, keeping the others in order."""
+        if len(slots):
+            kept = np.ones(self.count, dtype=np.bool_)
+            kept[slots] = False
+            self.keep(kept)
+
+    def step(self):
+        """Move and animate every projectile, dropping those that leave the world."""
+        n = self.count
+        if n == 0:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        x += self.dx[:n] * self.speed[:n]
+        y += self.dy[:n] * self.speed[:n]
+
+        # Next animation frame every 100ms of game time
+        current_time = game_clock.get_ticks()
+        frame_counts = np.array([len(frames) or 1 for frames in projectile_frames])[self.sprite[:n]]
+        due = current_time - self.last_frame_time[:n] > 100
+        self.frame_index[:n][due] = (self.frame_index[:n][due] + 1) % frame_counts[due]
+        self.last_frame_time[:n][due] = current_time
+
+        self.keep(world.inside(x, y))
+
+    def hits(self, team, left, top, right, bottom):
+        """Slots of `team` whose hit box overlaps the given rectangle, in firing order."""
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        return np.flatnonzero((self.team[:n] == team) & (x < right) & (x + self.width[:n] > left)
+                              & (y < bottom) & (y + self.height[:n] > top))
+
+    def draw(self, screen, camera_x, camera_y, alpha=1.0, view=None, team=None):
+        """Draw the projectiles of `team` (all when None) whose position is inside `view`."""
+        n = self.count
+        prev_x = self.prev_x[:n]
+        prev_y = self.prev_y[:n]
+        x = prev_x + (self.x[:n] - prev_x) * alpha
+        y = prev_y + (self.y[:n] - prev_y) * alpha
+        shown = np.ones(n, dtype=np.bool_) if team is None else self.team[:n] == team
+        if view is not None:
+            shown &= (x >= view.left) & (x < view.right) & (y >= view.top) & (y < view.bottom)
+
+        blits = []
+        for slot in np.flatnonzero(shown).tolist():
+            screen_x = x[slot] - camera_x
+            screen_y = y[slot] - camera_y
+            sprite = self.sprite[slot]
+            frames = projectile_frames[sprite]
+            if frames:
+                # Rotated frame for the projectile's direction (cached), centered on its position
+                rotated_frame = get_rotated_frame(frames, int(self.frame_index[slot]), int(self.angle_bucket[slot]))
+                blits.append((rotated_frame, rotated_frame.get_rect(center=(screen_x, screen_y))))
+            else:
+                # Fallback if frames are missing
+                pygame.draw.rect(screen, FALLBACK_COLORS[sprite], (screen_x, screen_y, 10, 10))
+        screen.blits(blits, doreturn=False)
+
+# Every projectile in play
+projectile_store = ProjectileStore()
+
+def fire_projectile(player, camera_x, camera_y, aim_x, aim_y):
+    """Fire a projectile from the player toward the aim point (screen coordinates)."""
+    dx = aim_x + camera_x - (player.x + player.size / 2)
+    dy = aim_y + camera_y - (player.y + player.size / 2)
     distance = math.sqrt(dx ** 2 + dy ** 2)
     if distance != 0:
         dx /= distance
         dy /= distance
 
-    # Calculate the angle of rotation in degrees
-    angle = math.degrees(math.atan2(-dy, dx))  # Negative dy because Pygame's y-axis is flipped
-
-    is_crit = random.random() < (player.crit_chance / 100)
+    is_crit = streams['crit'].random() < (player.crit_chance / 100)
     damage = player.projectile_damage * player.crit_damage if is_crit else player.projectile_damage
 
-    projectiles.append({
-        'x': player.x + player.size / 2,
-        'y': player.y + player.size / 2,
-        'dx': dx,
-        'dy': dy,
-        'damage': damage,
-        'is_crit': is_crit,
-        'frames': crit_projectile_frames if is_crit else normal_projectile_frames,
-        'frame_index': 0,  # Start at the first frame
-        'last_frame_time': pygame.time.get_ticks(),  # Time to control animation speed
-        'angle': angle  # Store the angle for rotation
-    })
+    projectile_store.add(
+        player.x + player.size / 2, player.y + player.size / 2, dx, dy, projectile_speed, damage,
+        PLAYER_TEAM, CRIT_SHOT if is_crit else NORMAL_SHOT, *PLAYER_SHOT_SIZE
+    )
 
 def move_projectiles():
-    """Update the position of all projectiles."""
-    for projectile in projectiles[:]:
-        projectile['x'] += projectile['dx'] * projectile_speed  # Move x
-        projectile['y'] += projectile['dy'] * projectile_speed  # Move y
-
-        # Remove projectiles that go out of map boundaries
-        if (projectile['x'] < 0 or projectile['x'] > MAP_WIDTH or
-                projectile['y'] < 0 or projectile['y'] > MAP_HEIGHT):
-            projectiles.remove(projectile)
-
-def draw_projectiles(screen, camera_x, camera_y):
-    """Draw all projectiles with animation and rotation."""
-    current_time = pygame.time.get_ticks()
-    for projectile in projectiles:
-        frames = projectile['frames']
-        frame_index = projectile['frame_index']
-
-        # Get the current frame
-        if frames:
-            frame = frames[frame_index]
-
-            # Rotate the frame based on the angle
-            rotated_frame = pygame.transform.rotate(frame, projectile['angle'])
-
-            # Get the rect of the rotated image for proper centering
-            frame_rect = rotated_frame.get_rect(center=(
-                projectile['x'] - camera_x,
-                projectile['y'] - camera_y
-            ))
-
-            # Draw the rotated frame
-            screen.blit(rotated_frame, frame_rect.topleft)
-        else:
-            # Fallback if frames are missing
-            pygame.draw.rect(screen, YELLOW if not projectile['is_crit'] else RED, (
-                projectile['x'] - camera_x,
-                projectile['y'] - camera_y,
-                10, 10
-            ))
-
-        # Update animation frame
-        if current_time - projectile['last_frame_time'] > 100:  # 100ms per frame
-            projectile['frame_index'] = (frame_index + 1) % len(frames)
-            projectile['last_frame_time'] = current_time
-
-# Boss projectile functions
-
-def move_boss_projectiles():
-    """Move all boss projectiles."""
-    for projectile in boss_projectiles[:]:
-        projectile['x'] += projectile['dx'] * projectile['speed']
-        projectile['y'] += projectile['dy'] * projectile['speed']
-
-        # Remove projectiles that go out of bounds
-        if (projectile['x'] < 0 or projectile['x'] > MAP_WIDTH or
-                projectile['y'] < 0 or projectile['y'] > MAP_HEIGHT):
-            boss_projectiles.remove(projectile)
-
-def draw_boss_projectiles(screen, camera_x, camera_y):
-    """Draw boss projectiles with animation."""
-    current_time = pygame.time.get_ticks()
-    for projectile in boss_projectiles:
-        frames = projectile['frames']
-        frame_index = projectile['frame_index']
-        frame = frames[frame_index]
-
-        # Rotate the frame based on angle
-        rotated_frame = pygame.transform.rotate(frame, projectile['angle'])
-        frame_rect = rotated_frame.get_rect(center=(
-            projectile['x'] - camera_x,
-            projectile['y'] - camera_y
-        ))
-
-        # Draw the projectile
-        screen.blit(rotated_frame, frame_rect.topleft)
-
-        # Update animation frame
-        if current_time - projectile['last_frame_time'] > 100:  # Adjust frame time as needed
-            projectile['frame_index'] = (frame_index + 1) % len(frames)
-            projectile['last_frame_time'] = current_time
+    """Update the position and animation of all projectiles."""
+    projectile_store.step()
+
+def draw_projectiles(screen, camera_x, camera_y, alpha=1.0, view=None, team=None):
+    """Draw the projectiles of `team` (all when None) with animation and rotation, skipping those outside `view`."""
+    projectile_store.draw(screen, camera_x, camera_y, alpha, view, team)
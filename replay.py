@@ -0,0 +1,184 @@
+import json
+import struct
+from controls import InputState
+
+# Replay file layout (little-endian):
+#
+#   header   b'MCGR', u16 version, u16 stream count,
+#            per stream: u8 name length, name, u64 seed,
+#            u32 length + JSON with the run setup (skills, resolution, world mode)
+#   records  u8 tag followed by its payload:
+#            'I'  u8 buttons, i16 aim x, i16 aim y, u16 repeat count
+#                 (the same input held for `count` consecutive ticks)
+#            'L'  u8 index of the upgrade chosen on level up
+#            'E'  end of run: i32 score, u16 level, f64 health, u32 enemies
+MAGIC = b'MCGR'
+VERSION = 12  # Bumped whenever the simulation changes in a way that desyncs older replays
+
+INPUT_RECORD = struct.Struct('<BhhH')
+LEVEL_UP_RECORD = struct.Struct('<B')
+END_RECORD = struct.Struct('<iHdI')
+MAX_REPEAT = 0xFFFF
+
+# Movement buttons packed into one byte
+BUTTONS = (('up', 1), ('down', 2), ('left', 4), ('right', 8))
+
+def pack_buttons(state):
+    """Pack the movement buttons of an InputState into a bit mask."""
+    return sum(bit for name, bit in BUTTONS if getattr(state, name))
+
+def unpack_input(buttons, aim_x, aim_y):
+    """Rebuild an InputState from its packed form."""
+    pressed = {name: bool(buttons & bit) for name, bit in BUTTONS}
+    return InputState(aim_x=aim_x, aim_y=aim_y, **pressed)
+
+def run_summary(player, enemy_manager):
+    """End-of-run state stored in the log and compared on playback."""
+    return {
+        "score": player.score,
+        "level": player.level,
+        "health": float(player.health),
+        "enemies": len(enemy_manager.enemies),
+    }
+
+class ReplayRecorder:
+    """Writes a run (stream seeds, per-tick input, level-up choices) to a replay file."""
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.pending = None  # Packed input waiting to be written
+        self.repeat = 0  # Ticks the pending input was held
+
+    def start(self, seeds, skills, resolution, world_mode='arena'):
+        """Open the file and write the header for a new run."""
+        self.file = open(self.path, 'wb')
+        self.file.write(MAGIC + struct.pack('<HH', VERSION, len(seeds)))
+        for name, seed in seeds.items():
+            encoded = name.encode('ascii')
+            self.file.write(struct.pack('<B', len(encoded)) + encoded + struct.pack('<Q', seed))
+        setup = json.dumps({"skills": skills, "resolution": list(resolution), "world": world_mode}).encode('utf-8')
+        self.file.write(struct.pack('<I', len(setup)) + setup)
+
+    def record_input(self, state):
+        """Record the input used for one tick."""
+        packed = (pack_buttons(state), state.aim_x, state.aim_y)
+        if packed == self.pending and self.repeat < MAX_REPEAT:
+            self.repeat += 1
+            return
+        self.flush()
+        self.pending = packed
+        self.repeat = 1
+
+    def record_level_up(self, index):
+        """Record the upgrade chosen on level up."""
+        self.flush()
+        self.file.write(b'L' + LEVEL_UP_RECORD.pack(index))
+
+    def flush(self):
+        """Write out the input held since the last change."""
+        if self.pending is not None:
+            self.file.write(b'I' + INPUT_RECORD.pack(*self.pending, self.repeat))
+            self.pending = None
+            self.repeat = 0
+
+    def close(self, summary):
+        """Write the end-of-run record and close the file."""
+        if self.file is None:
+            return
+        self.flush()
+        self.file.write(b'E' + END_RECORD.pack(
+            summary["score"], summary["level"], summary["health"], summary["enemies"]
+        ))
+        self.file.close()
+        self.file = None
+
+class RecordingInput:
+    """Wraps an input source and records everything it produces."""
+    def __init__(self, controls, recorder):
+        self.controls = controls
+        self.recorder = recorder
+
+    def poll(self, player, enemy_manager, camera_x, camera_y):
+        state = self.controls.poll(player, enemy_manager, camera_x, camera_y)
+        self.recorder.record_input(state)
+        return state
+
+    def choose_upgrade(self, player, options):
+        index = self.controls.choose_upgrade(player, options)
+        self.recorder.record_level_up(index)
+        return index
+
+class ReplayInput:
+    """Plays a replay file back as the input source of a run."""
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        if data[:4] != MAGIC:
+            raise ValueError(f"{path} is not a replay file")
+        version, stream_count = struct.unpack_from('<HH', data, 4)
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+        offset = 8
+
+        self.seeds = {}
+        for _ in range(stream_count):
+            name_length = data[offset]
+            name = data[offset + 1:offset + 1 + name_length].decode('ascii')
+            offset += 1 + name_length
+            self.seeds[name] = struct.unpack_from('<Q', data, offset)[0]
+            offset += 8
+
+        setup_length = struct.unpack_from('<I', data, offset)[0]
+        setup = json.loads(data[offset + 4:offset + 4 + setup_length].decode('utf-8'))
+        offset += 4 + setup_length
+        self.skills = setup["skills"]
+        self.resolution = tuple(setup["resolution"])
+        self.world_mode = setup.get("world", 'arena')  # Older replays were all arena runs
+
+        # Records, in the order the run produced them
+        self.records = []
+        self.summary = None  # None if the recording was cut short
+        while offset < len(data):
+            tag = data[offset:offset + 1]
+            offset += 1
+            if tag == b'I':
+                buttons, aim_x, aim_y, repeat = INPUT_RECORD.unpack_from(data, offset)
+                self.records.append(('input', unpack_input(buttons, aim_x, aim_y), repeat))
+                offset += INPUT_RECORD.size
+            elif tag == b'L':
+                self.records.append(('level_up', LEVEL_UP_RECORD.unpack_from(data, offset)[0], 1))
+                offset += LEVEL_UP_RECORD.size
+            elif tag == b'E':
+                score, level, health, enemies = END_RECORD.unpack_from(data, offset)
+                self.summary = {"score": score, "level": level, "health": health, "enemies": enemies}
+                offset += END_RECORD.size
+            else:
+                raise ValueError(f"Corrupt replay record {tag!r} at byte {offset - 1}")
+
+        self.ticks = sum(repeat for kind, _, repeat in self.records if kind == 'input')
+        self.position = 0  # Next record to play
+        self.remaining = 0  # Ticks left on the current input record
+        self.state = None
+
+    def next_record(self, kind):
+        """Advance to the next record, which must be of the given kind."""
+        record_kind, value, repeat = self.records[self.position]
+        if record_kind != kind:
+            raise ValueError(f"Replay out of sync: expected {kind}, found {record_kind}")
+        self.position += 1
+        return value, repeat
+
+    def poll(self, player, enemy_manager, camera_x, camera_y):
+        """Return the recorded input for the current tick."""
+        if self.remaining == 0:
+            self.state, self.remaining = self.next_record('input')
+        self.remaining -= 1
+        return self.state
+
+    def choose_upgrade(self, player, options):
+        """Return the recorded level-up choice."""
+        return self.next_record('level_up')[0]
+
+    def matches(self, summary):
+        """True if a played-back run ended in the recorded state."""
+        return self.summary is not None and all(summary[key] == value for key, value in self.summary.items())
@@ -0,0 +1,41 @@
+import random
+
+# Named random streams. Every system draws from its own stream, so a run can be
+# replayed from the stream seeds alone and an extra draw in one system doesn't
+# shift the numbers any other system sees.
+STREAM_NAMES = (
+    'spawn',         # Enemy type and spawn position (EnemyManager.spawn_enemy)
+    'crit',          # Critical hit rolls (fire_projectile)
+    'boss_shots',    # Boss1Enemy shot offsets
+    'boss_summons',  # Boss2Enemy skeleton placement
+    'level_up',      # Upgrades offered on level up (Menu.roll_level_up_options)
+)
+
+streams = {name: random.Random() for name in STREAM_NAMES}
+stream_seeds = {}  # Seed of every stream for the current run
+run_seed = None  # Run seed the streams were derived from, if they were
+
+def derive_seeds(seed):
+    """Derive the seed of every stream from a single run seed."""
+    master = random.Random(seed)
+    return {name: master.getrandbits(64) for name in STREAM_NAMES}
+
+def seed_streams(seeds=None):
+    """Seed every stream for a new run.
+
+    `seeds` is either a run seed (int) or the seed of every stream (dict); a
+    fresh run seed is drawn if neither is given.
+    """
+    global run_seed
+    if seeds is None:
+        seeds = random.getrandbits(64)
+    if isinstance(seeds, int):
+        run_seed = seeds
+        seeds = derive_seeds(seeds)
+    else:
+        run_seed = None
+    for name in STREAM_NAMES:
+        streams[name].seed(seeds[name])
+    stream_seeds.clear()
+    stream_seeds.update(seeds)
+    return stream_seeds
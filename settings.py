@@ -1,12 +1,45 @@
+import os
 import pygame
+from hitch_detector import hitch_detector
 
 # Screen dimensions
 WIDTH, HEIGHT = 1366, 768
+MAX_FPS = 240  # Render rate cap; the simulation itself always runs at game_clock.TICK_RATE
+
+# Every run is recorded here so it can be replayed with simulate.py --replay
+RECORD_REPLAYS = True
+REPLAY_PATH = './replays/last-run.mcgr'
+
+# Record a timeline of every frame (see tracer.py). Written to ./traces when a
+# run ends or when F4 is pressed.
+TRACE_ENABLED = False
+
+# Frames profiled when F5 is pressed (see profiler.py); reports go to ./profiles
+PROFILE_FRAMES = 600
+
+# Frames slower than this are logged with their causes to ./logs/hitches.log
+# (see hitch_detector.py). Set to None to turn the watchdog off.
+HITCH_BUDGET_MS = 1000 / 30
+
+# Game speed in real time (see game_clock.py): 2 plays twice as fast, 0.5 in slow motion
+TIME_SCALE = 1.0
+
+# Most overlapping enemy pairs pushed apart per tick (see crowd_separation.py).
+# Bounds the step's cost however tightly enemies are packed.
+SEPARATION_PAIR_BUDGET = 8000
+
+# Extra border (pixels) kept around the window when culling off-screen sprites,
+# so projectiles and XP drops (culled by position) and HP bars are not cut off
+CULL_MARGIN = 64
 
 # Game world size (map limits)
 MAP_WIDTH = 3000
 MAP_HEIGHT = 3000
 
+# 'arena' plays on the MAP_WIDTH x MAP_HEIGHT map, 'endless' streams an
+# unbounded world around the player (see world.py)
+WORLD_MODE = 'arena'
+
 try:
     # Load the background image
     background_image = pygame.image.load('./assets/images/background/background-ingame-final.png')
@@ -45,48 +78,59 @@ font_button = pygame.font.Font(pygame.font.match_font('arial'), 30)
 font_credit = pygame.font.Font(pygame.font.match_font('arial'), 20)
 font_health = pygame.font.Font(pygame.font.match_font('arial'), 25)
 font_score = pygame.font.Font(pygame.font.match_font('arial'), 25)
+font_overlay = pygame.font.Font(pygame.font.match_font('consolas,dejavusansmono,couriernew'), 15)
 
 # Audio settings
 pygame.mixer.init()  # Initialize the pygame mixer
 
+class GameSound(pygame.mixer.Sound):
+    """Sound that reports every play to the hitch watchdog."""
+    def __init__(self, path):
+        super().__init__(path)
+        self.name = os.path.basename(path)
+
+    def play(self, *args, **kwargs):
+        hitch_detector.note('sound', name=self.name)
+        return super().play(*args, **kwargs)
+
 # Sound effects
 try:
     # Music
-    main_menu_music = pygame.mixer.Sound('./assets/audio/main-menu-music.wav') 
-    game_music = pygame.mixer.Sound('./assets/audio/ingame-music.wav')         
-    boss_music = pygame.mixer.Sound('./assets/audio/boss-music.wav')
-    skill_music = pygame.mixer.Sound('./assets/audio/skill-music.mp3')           
+    main_menu_music = GameSound('./assets/audio/main-menu-music.wav') 
+    game_music = GameSound('./assets/audio/ingame-music.wav')         
+    boss_music = GameSound('./assets/audio/boss-music.wav')
+    skill_music = GameSound('./assets/audio/skill-music.mp3')           
 
     # Menu Interaction
-    hover_sound = pygame.mixer.Sound('./assets/audio/menu-hover.wav')          
-    click_sound = pygame.mixer.Sound('./assets/audio/menu-click.wav')          
+    hover_sound = GameSound('./assets/audio/menu-hover.wav')          
+    click_sound = GameSound('./assets/audio/menu-click.wav')          
 
     # Sound effects
         # Projectile sounds
-    normal_hit_sound = pygame.mixer.Sound('./assets/audio/normal-hit.wav')    
-    crit_hit_sound = pygame.mixer.Sound('./assets/audio/crit-hit.wav')      
-    block_hit_sound = pygame.mixer.Sound('./assets/audio/block_hit.mp3')  
+    normal_hit_sound = GameSound('./assets/audio/normal-hit.wav')    
+    crit_hit_sound = GameSound('./assets/audio/crit-hit.wav')      
+    block_hit_sound = GameSound('./assets/audio/block_hit.mp3')  
 
         # xp and level up sounds
-    collect_xp_sound = pygame.mixer.Sound('./assets/audio/xp-collect.wav')    
-    level_up_sound = pygame.mixer.Sound('./assets/audio/level-up.wav')   
-    skill_bought_sound = pygame.mixer.Sound('./assets/audio/skill-bought.mp3')
-    skill_failed_sound = pygame.mixer.Sound('./assets/audio/skill-failed.mp3') 
+    collect_xp_sound = GameSound('./assets/audio/xp-collect.wav')    
+    level_up_sound = GameSound('./assets/audio/level-up.wav')   
+    skill_bought_sound = GameSound('./assets/audio/skill-bought.mp3')
+    skill_failed_sound = GameSound('./assets/audio/skill-failed.mp3') 
 
         # Player sounds
-    hurt_sound = pygame.mixer.Sound('./assets/audio/hurt.wav')               
-    death_sound = pygame.mixer.Sound('./assets/audio/death/player-death.wav')
+    hurt_sound = GameSound('./assets/audio/hurt.wav')               
+    death_sound = GameSound('./assets/audio/death/player-death.wav')
         
         # Ability sounds
-    ability_obtained_sound = pygame.mixer.Sound('./assets/audio/ability-obtained.wav')
-    ability_used_sound = pygame.mixer.Sound('./assets/audio/ability-used.wav')         
+    ability_obtained_sound = GameSound('./assets/audio/ability-obtained.wav')
+    ability_used_sound = GameSound('./assets/audio/ability-used.wav')         
 
         # Enemy sounds
-    bat_death_sound = pygame.mixer.Sound('./assets/audio/death/bat-death.wav')
-    skeleton_death_sound = pygame.mixer.Sound('./assets/audio/death/skeleton-death.wav')
-    blob_death_sound = pygame.mixer.Sound('./assets/audio/death/blob-death.wav')
-    boss_death_sound = pygame.mixer.Sound('./assets/audio/death/boss-death.wav')
-    boss_spawn_sound = pygame.mixer.Sound('./assets/audio/boss-spawn.wav')
+    bat_death_sound = GameSound('./assets/audio/death/bat-death.wav')
+    skeleton_death_sound = GameSound('./assets/audio/death/skeleton-death.wav')
+    blob_death_sound = GameSound('./assets/audio/death/blob-death.wav')
+    boss_death_sound = GameSound('./assets/audio/death/boss-death.wav')
+    boss_spawn_sound = GameSound('./assets/audio/boss-spawn.wav')
 
 except pygame.error as e:
     print(f"Error loading sounds: {e}")
@@ -0,0 +1,34 @@
+class SpatialGrid:
+    """Uniform grid broad phase that buckets objects by the cells their rect overlaps."""
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}  # (cell_x, cell_y) -> list of inserted items
+
+    def clear(self):
+        """Remove every item from the grid."""
+        self.cells.clear()
+
+    def insert(self, item, x, y, width, height):
+        """Insert an item into every cell overlapped by the given rect."""
+        cell_size = self.cell_size
+        cells = self.cells
+        for cell_x in range(int(x // cell_size), int((x + width) // cell_size) + 1):
+            for cell_y in range(int(y // cell_size), int((y + height) // cell_size) + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket is None:
+                    cells[(cell_x, cell_y)] = [item]
+                else:
+                    bucket.append(item)
+
+    def query(self, x, y, width, height):
+        """Yield the items stored in the cells overlapped by the given rect.
+
+        An item spanning several of those cells is yielded once per cell.
+        """
+        cell_size = self.cell_size
+        cells = self.cells
+        for cell_x in range(int(x // cell_size), int((x + width) // cell_size) + 1):
+            for cell_y in range(int(y // cell_size), int((y + height) // cell_size) + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket:
+                    yield from bucket
@@ -0,0 +1,71 @@
+import math
+import numpy as np
+import pygame
+from settings import *
+from rng import streams
+from world import world
+
+SPAWN_RING_MARGIN = 100  # Distance (pixels) between the ring and the corners of the view
+DESPAWN_DISTANCE = 1.6  # Enemies further than this many ring radii from the ring's center are despawned
+DESPAWN_CHECK_TICKS = 30  # Ticks between two despawn sweeps
+POOL_LIMIT = 256  # Despawned enemies kept per type for reuse
+
+class SpawnDirector:
+    """Spawns enemies on a ring just outside the view and pools the ones left far behind."""
+    def __init__(self):
+        self.pools = {}  # Enemy class -> despawned enemies ready for reuse
+        self.ticks_since_sweep = 0
+
+    def ring(self):
+        """Center and radius of the spawn ring around the view."""
+        screen_width, screen_height = pygame.display.get_surface().get_size()
+        left, top = world.camera_offset(world.focus_x, world.focus_y, screen_width, screen_height)
+        radius = math.hypot(screen_width, screen_height) / 2 + SPAWN_RING_MARGIN
+        return left + screen_width / 2, top + screen_height / 2, radius
+
+    def spawn_position(self, width, height):
+        """Top-left corner for a new enemy of the given size, centered on a random point of the ring."""
+        center_x, center_y, radius = self.ring()
+        angle = streams['spawn'].uniform(0, 2 * math.pi)
+        return (center_x + math.cos(angle) * radius - width / 2,
+                center_y + math.sin(angle) * radius - height / 2)
+
+    def create(self, enemy_type):
+        """Return a fresh enemy of `enemy_type`, reusing a pooled one when available."""
+        pool = self.pools.get(enemy_type)
+        if pool:
+            enemy = pool.pop()
+            enemy.reset()
+            return enemy
+        return enemy_type(x=0, y=0)
+
+    def recycle(self, enemy):
+        """Keep an enemy removed from play for a later spawn of the same type."""
+        pool = self.pools.setdefault(type(enemy), [])
+        if len(pool) < POOL_LIMIT:
+            pool.append(enemy)
+
+    def update(self, enemy_manager):
+        """Every DESPAWN_CHECK_TICKS ticks, despawn the ordinary enemies far outside the spawn ring."""
+        self.ticks_since_sweep += 1
+        if self.ticks_since_sweep < DESPAWN_CHECK_TICKS:
+            return
+        self.ticks_since_sweep = 0
+
+        store = enemy_manager.store
+        n = store.count
+        # Measured from the ring's center, which is the view's rather than the player's near the map edges
+        center_x, center_y, radius = self.ring()
+        limit = radius * DESPAWN_DISTANCE
+        dx = store.x[:n] + store.width[:n] / 2 - center_x
+        dy = store.y[:n] + store.height[:n] / 2 - center_y
+        self.despawn(enemy_manager, dx * dx + dy * dy > limit * limit)
+
+    def despawn(self, enemy_manager, far_mask):
+        """Remove the ordinary enemies whose store slots are set in `far_mask` and pool them."""
+        store = enemy_manager.store
+        for slot in np.flatnonzero(far_mask)[::-1]:  # Highest slot first, so removals don't move pending ones
+            enemy = store.enemies[slot]
+            if enemy.despawns:
+                enemy_manager.remove_enemy(enemy)
+                self.recycle(enemy)
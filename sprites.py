@@ -0,0 +1,66 @@
+import time
+import pygame
+from tracer import tracer
+from hitch_detector import hitch_detector
+
+# Process-wide sprite registry. Every frame set is decoded, converted and
+# scaled once, then shared by all instances that use it (flyweight).
+_frame_sets = {}
+_flipped_frame_sets = {}
+_images = {}
+
+ENEMY_IMAGE_DIR = './assets/images/enemies'
+
+def prepare_surface(surface):
+    """Convert a freshly loaded surface to the display pixel format if a display exists."""
+    if pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
+def load_frames(folder, count, size):
+    """Return the shared, pre-scaled frames `folder/0.png` .. `folder/{count - 1}.png`."""
+    key = (folder, count, tuple(size))
+    frames = _frame_sets.get(key)
+    if frames is None:
+        start = time.perf_counter()
+        frames = [
+            pygame.transform.scale(prepare_surface(pygame.image.load(f'{folder}/{i}.png')), size)
+            for i in range(count)
+        ]
+        _frame_sets[key] = frames
+        end = time.perf_counter()
+        if tracer.enabled:
+            tracer.add_span('load_frames', 'assets', start, end, {"folder": folder, "count": count})
+        hitch_detector.note('load_frames', folder=folder, count=count, ms=round((end - start) * 1000, 2))
+        hitch_detector.count_surfaces('load_frames', count)
+    return frames
+
+def load_image(path, size=None):
+    """Return a shared copy of a single image, optionally scaled to `size`."""
+    key = (path, tuple(size) if size else None)
+    image = _images.get(key)
+    if image is None:
+        start = time.perf_counter()
+        image = prepare_surface(pygame.image.load(path))
+        if size:
+            image = pygame.transform.scale(image, size)
+        _images[key] = image
+        end = time.perf_counter()
+        if tracer.enabled:
+            tracer.add_span('load_image', 'assets', start, end, {"path": path})
+        hitch_detector.note('load_image', path=path, ms=round((end - start) * 1000, 2))
+        hitch_detector.count_surfaces('load_image')
+    return image
+
+def load_enemy_frames(name, count, size):
+    """Return the shared frame set of an enemy type, e.g. `load_enemy_frames('bat', 4, (50, 35))`."""
+    return load_frames(f'{ENEMY_IMAGE_DIR}/{name}', count, size)
+
+def get_flipped_frames(frames):
+    """Return the horizontally mirrored copy of a shared frame set."""
+    flipped = _flipped_frame_sets.get(id(frames))
+    if flipped is None:
+        flipped = [pygame.transform.flip(frame, True, False) for frame in frames]
+        _flipped_frame_sets[id(frames)] = flipped
+        hitch_detector.count_surfaces('flip_frames', len(flipped))
+    return flipped
@@ -0,0 +1,13 @@
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # Assets are loaded relative to the repository root
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((1366, 768))
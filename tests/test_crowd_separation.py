@@ -0,0 +1,30 @@
+import random
+
+from crowd_separation import CrowdSeparation
+from enemy_manager import EnemyManager
+from enemies import SkeletonEnemy, Boss1Enemy, Boss2Enemy
+from world import world
+
+def test_large_enemies_pair_once():
+    world.reset()
+    enemy_manager = EnemyManager()
+    first, second = Boss1Enemy(1000, 1000), Boss2Enemy(1146, 1000)  # 150 px wide, overlapping by 4 px
+    enemy_manager.add_enemy(first)
+    enemy_manager.add_enemy(second)
+    separation = CrowdSeparation()
+    separation.solve(enemy_manager.store)
+    assert separation.pairs == 2  # One pair, seen from both sides
+    assert first.x == 999  # Half the overlap, half of it resolved this tick
+
+def test_pairs_stay_within_budget_with_bosses():
+    world.reset()
+    rng = random.Random(3)
+    enemy_manager = EnemyManager()
+    enemy_manager.add_enemy(Boss1Enemy(1000, 1000))
+    enemy_manager.add_enemy(Boss2Enemy(1100, 1000))
+    for _ in range(400):
+        enemy_manager.add_enemy(SkeletonEnemy(rng.uniform(800, 1400), rng.uniform(800, 1300)))
+    separation = CrowdSeparation(pair_budget=2000)
+    for _ in range(5):
+        separation.solve(enemy_manager.store)
+        assert 0 < separation.pairs <= 2000
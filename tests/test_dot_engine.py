@@ -0,0 +1,77 @@
+from dot_engine import DotEngine, WHEEL_SLOTS
+from enemy_manager import EnemyManager
+from enemies import SkeletonEnemy
+from game_clock import game_clock, TICK_RATE
+
+HP = 1000
+
+def setup_run(count=1):
+    """A fresh clock and engine with `count` enemies in play."""
+    game_clock.reset()
+    engine = DotEngine()
+    engine.clear()
+    enemy_manager = EnemyManager()
+    enemies = []
+    for _ in range(count):
+        enemy = SkeletonEnemy(0, 0)
+        enemy_manager.add_enemy(enemy)
+        enemy.hp = HP
+        enemies.append(enemy)
+    return engine, enemy_manager, enemies
+
+def play(engine, ticks):
+    for _ in range(ticks):
+        game_clock.advance()
+        engine.update()
+
+def test_damage_every_interval_until_the_end():
+    engine, _, (enemy,) = setup_run()
+    engine.apply(enemy, 'burn', 2, 0.5, 2)
+    engine.update()
+    assert enemy.hp == HP - 2  # First damage right away
+    play(engine, 5 * TICK_RATE)
+    assert enemy.hp == HP - 2 * 5  # Ticks 0, 30, 60, 90 and 120
+    assert not engine.active
+
+def test_intervals_longer_than_the_wheel():
+    engine, _, (enemy,) = setup_run()
+    interval = (WHEEL_SLOTS + 44) / TICK_RATE
+    engine.apply(enemy, 'poison', 3, interval, interval * 2)
+    engine.update()
+    play(engine, WHEEL_SLOTS)
+    assert enemy.hp == HP - 3  # Passing the slot a turn early deals nothing
+    play(engine, 3 * WHEEL_SLOTS)
+    assert enemy.hp == HP - 3 * 3
+
+def test_recycled_enemy_drops_stale_effects():
+    engine, enemy_manager, (enemy,) = setup_run()
+    engine.apply(enemy, 'burn', 2, 0.5, 2)
+    engine.update()
+    enemy_manager.remove_enemy(enemy)
+    enemy.reset()  # Pooled, then spawned again
+    enemy_manager.add_enemy(enemy)
+    enemy.hp = HP
+    play(engine, 5 * TICK_RATE)
+    assert enemy.hp == HP
+    assert not engine.active
+
+    engine.apply(enemy, 'burn', 2, 0.5, 2)  # The new life can burn again
+    play(engine, 1)
+    assert enemy.hp == HP - 2
+
+def test_apply_during_update_lands_on_next_tick():
+    engine, _, (spreader, target) = setup_run(2)
+
+    class Spreading(SkeletonEnemy):
+        __slots__ = ()
+
+        def take_damage(self, damage):
+            engine.apply(target, 'poison', 5, 1, 1)
+            return super().take_damage(damage)
+    spreader.__class__ = Spreading
+
+    engine.apply(spreader, 'burn', 1, 1, 1)
+    engine.update()
+    assert target.hp == HP  # Tick 0 was already being processed
+    play(engine, 1)
+    assert target.hp == HP - 5
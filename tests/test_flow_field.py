@@ -0,0 +1,47 @@
+import numpy as np
+import pygame
+
+from flow_field import FlowField, FLOW_CELL_SIZE
+from world import world
+
+def center(row, column):
+    """Map position of the middle of a flow field cell."""
+    return (column + 0.5) * FLOW_CELL_SIZE, (row + 0.5) * FLOW_CELL_SIZE
+
+def field_around(blocked_cell, player_cell):
+    world.reset()
+    row, column = blocked_cell
+    world.set_obstacles([pygame.Rect(column * FLOW_CELL_SIZE, row * FLOW_CELL_SIZE, FLOW_CELL_SIZE, FLOW_CELL_SIZE)])
+    field = FlowField()
+    field.update(*center(*player_cell))
+    return field
+
+def steered(field, row, column):
+    """Direction steer() gives an enemy in the middle of a cell heading straight for the player."""
+    x, y = center(row, column)
+    target_x, target_y = center(*field.target_cell)
+    dx = np.array([target_x - x]) / np.hypot(target_x - x, target_y - y)
+    dy = np.array([target_y - y]) / np.hypot(target_x - x, target_y - y)
+    field.steer(np.array([x]), np.array([y]), dx, dy, np.array([True]))
+    return float(dx[0]), float(dy[0])
+
+def test_blocked_line_of_sight_is_detoured():
+    # The path around the obstacle is as short as the straight line, which still runs through it
+    field = field_around((11, 15), (10, 10))
+    assert not field.straight[(12 + 1) * field.stride + 20 + 1]
+
+    # Following the field from the enemy's cell reaches the player without entering the obstacle
+    x, y = center(12, 20)
+    for _ in range(200):
+        row, column = field.cell_of(x, y)
+        assert (row, column) != (11, 15)
+        if (row, column) == field.target_cell:
+            break
+        dx, dy = steered(field, row, column)
+        x, y = x + dx * 8, y + dy * 8
+    assert field.cell_of(x, y) == field.target_cell
+
+def test_clear_line_of_sight_goes_straight():
+    field = field_around((11, 15), (10, 10))
+    assert field.straight[(10 + 1) * field.stride + 20 + 1]
+    assert steered(field, 10, 20) == (-1.0, 0.0)
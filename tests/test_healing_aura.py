@@ -0,0 +1,33 @@
+import main
+from game_clock import game_clock, TICK_RATE
+
+HEAL_SKILLS = {"heal": {"type": "abilities", "level": 1, "max_level": 5}}
+
+def play(player, seconds):
+    """Advance the game clock, starting from 10 HP. Returns the HP gained."""
+    player.health = 10
+    for _ in range(seconds * TICK_RATE):
+        game_clock.advance()
+    return player.health - 10
+
+def test_menu_started_run_heals(monkeypatch):
+    monkeypatch.setattr(main.menu, 'load_settings', lambda: {"skills": HEAL_SKILLS, "achievements": {}})
+    stale_player, _, achievements = main.reset_game()  # What the menu was opened with
+
+    gained = []
+    def game_loop(player, enemy_manager, achievements):
+        assert player is not stale_player
+        gained.append(play(player, 25))
+
+    main.menu.start_game(main.reset_game, game_loop, achievements)
+    assert gained == [14]  # Two heals of 7 HP, 9 seconds apart
+
+def test_reinitialized_abilities_heal_once(monkeypatch):
+    monkeypatch.setattr(main.menu, 'load_settings', lambda: {"skills": HEAL_SKILLS, "achievements": {}})
+    player, _, _ = main.reset_game()
+    for _ in range(3):  # Leaving the skill tree re-creates the abilities
+        player.clear_abilities()
+        player.initialize_abilities(HEAL_SKILLS)
+        player.apply_skill_upgrades(HEAL_SKILLS)
+
+    assert play(player, 25) == 14
@@ -0,0 +1,42 @@
+import numpy as np
+
+from projectile import ProjectileStore, PLAYER_TEAM, ENEMY_TEAM, NORMAL_SHOT, BOSS_SHOT
+from world import world
+
+def fire(store, x, y, team, damage, dx=1.0, dy=0.0):
+    sprite = NORMAL_SHOT if team == PLAYER_TEAM else BOSS_SHOT
+    store.add(x, y, dx, dy, 5, damage, team, sprite, 10, 10)
+
+def damages(store):
+    return store.damage[:store.count].tolist()
+
+def test_removals_keep_firing_order():
+    store = ProjectileStore(capacity=2)  # Grows while firing
+    for damage in range(8):
+        fire(store, 100 * damage, 100, PLAYER_TEAM, damage)
+    store.discard(np.array([1, 4]))
+    assert damages(store) == [0, 2, 3, 5, 6, 7]
+    store.keep(store.damage[:store.count] % 2 == 0)
+    assert damages(store) == [0, 2, 6]
+    assert store.x[:store.count].tolist() == [0, 200, 600]  # Every field moves with its slot
+
+def test_step_culls_in_order():
+    world.reset()
+    store = ProjectileStore()
+    fire(store, 500, 500, PLAYER_TEAM, 1)
+    fire(store, 2, 500, PLAYER_TEAM, 2, dx=-1.0)  # Leaves the map on this step
+    fire(store, 700, 500, ENEMY_TEAM, 3)
+    store.step()
+    assert damages(store) == [1, 3]
+    assert store.x[:store.count].tolist() == [505, 705]
+
+def test_hits_and_counts_filter_by_team():
+    store = ProjectileStore()
+    fire(store, 100, 100, PLAYER_TEAM, 1)
+    fire(store, 105, 100, ENEMY_TEAM, 2)
+    fire(store, 110, 100, PLAYER_TEAM, 3)
+    fire(store, 900, 900, PLAYER_TEAM, 4)
+    assert store.hits(PLAYER_TEAM, 90, 90, 130, 130).tolist() == [0, 2]
+    assert store.hits(ENEMY_TEAM, 90, 90, 130, 130).tolist() == [1]
+    assert store.count_team(PLAYER_TEAM) == 3
+    assert store.count_team(ENEMY_TEAM) == 1
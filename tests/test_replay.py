@@ -0,0 +1,19 @@
+import pytest
+
+import main
+from controls import AutoPilotInput
+from replay import ReplayInput, ReplayRecorder
+from simulate import load_skills
+
+@pytest.mark.parametrize('world_mode', ['arena', 'endless'])
+def test_replay_matches_recording(tmp_path, world_mode):
+    path = str(tmp_path / 'run.mcgr')
+    skills = load_skills('max', main.menu.load_settings()["skills"])  # Every ability in play
+    recorded = main.run_simulation(AutoPilotInput(7), 600, seeds=7, skills=skills, world_mode=world_mode,
+                                   recorder=ReplayRecorder(path))
+
+    replay = ReplayInput(path)
+    played = main.run_simulation(replay, replay.ticks, seeds=replay.seeds, skills=replay.skills,
+                                 resolution=replay.resolution, world_mode=replay.world_mode)
+    assert replay.ticks == recorded["ticks"] == 600
+    assert replay.matches(played)
@@ -0,0 +1,18 @@
+from enemy_manager import EnemyManager
+from enemies import SkeletonEnemy
+from world import world
+from rng import seed_streams
+
+def test_corner_spawns_survive():
+    seed_streams(1)
+    world.reset()
+    world.focus_x, world.focus_y = 0, 0  # Player parked in the top-left corner of the arena
+    enemy_manager = EnemyManager()
+    for _ in range(144):
+        enemy = enemy_manager.director.create(SkeletonEnemy)
+        enemy.x, enemy.y = enemy_manager.director.spawn_position(*enemy.size)
+        enemy_manager.add_enemy(enemy)
+
+    for _ in range(60):
+        enemy_manager.director.update(enemy_manager)
+    assert len(enemy_manager.enemies) == 144
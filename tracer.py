@@ -0,0 +1,66 @@
+import functools
+import json
+import os
+import time
+from collections import deque
+
+TRACE_BUFFER_EVENTS = 150000  # Spans kept in the ring buffer (a few minutes of play)
+TRACE_DIR = './traces'
+
+class Tracer:
+    """Opt-in ring buffer of begin/end spans, exported as Chrome trace-event JSON (Perfetto, chrome://tracing)."""
+    def __init__(self):
+        self.enabled = False
+        self.events = deque(maxlen=TRACE_BUFFER_EVENTS)
+        self.origin = time.perf_counter()  # Trace timestamps are relative to this
+
+    def add_span(self, name, category, start, end, args=None):
+        """Record a span between two time.perf_counter() readings."""
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",  # Complete event: begin timestamp plus duration
+            "ts": (start - self.origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": 1,
+            "tid": 1,
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def flush(self, path=None):
+        """Write the buffered spans to a trace file and empty the buffer. Returns the path."""
+        if not self.events:
+            return None
+        if path is None:
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            path = os.path.join(TRACE_DIR, time.strftime("trace-%Y%m%d-%H%M%S.json"))
+
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "mcg-vampire-survivors"}},
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "game loop"}},
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": metadata + list(self.events), "displayTimeUnit": "ms"}, f)
+        self.events.clear()
+        print(f"[TRACE] Wrote {path}")
+        return path
+
+def traced(name, category='game'):
+    """Decorator recording a span for every call of the function while tracing is enabled."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.add_span(name, category, start, time.perf_counter())
+        return wrapper
+    return decorate
+
+# Shared tracer; enable it with TRACE_ENABLED in settings.py or simulate.py --trace
+tracer = Tracer()
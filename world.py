@@ -0,0 +1,140 @@
+import numpy as np
+import pygame
+from settings import *
+from background import BACKGROUND_TILE_SIZE
+from xp import xp_drops, remove_xp_drop
+
+# Endless worlds are streamed in square chunks of CHUNK_TILES x CHUNK_TILES background tiles
+CHUNK_TILES = 4
+CHUNK_SIZE = CHUNK_TILES * BACKGROUND_TILE_SIZE
+LOAD_RADIUS = 2  # Chunks loaded in every direction around the player's chunk
+EVICT_RADIUS = 3  # Chunks (and what is in them) further away are dropped; the gap stops thrashing at borders
+
+class Chunk:
+    """One CHUNK_SIZE square of the endless world, holding its background tiles."""
+    def __init__(self, chunk_x, chunk_y, background):
+        first_column = chunk_x * CHUNK_TILES
+        first_row = chunk_y * CHUNK_TILES
+        # The background image is repeated across the plane; tiles are shared, not copied
+        self.tiles = [
+            [background.wrapped_tile(first_column + column, first_row + row) for column in range(CHUNK_TILES)]
+            for row in range(CHUNK_TILES)
+        ]
+
+class World:
+    """Bounds of the map: the fixed arena, or endless chunks streamed in around the player."""
+    def __init__(self):
+        self.endless = False
+        self.background = None  # TiledBackground, set once the display exists
+        self.chunks = {}  # (chunk x, chunk y) -> Chunk, endless mode only
+        self.center_chunk = None  # Chunk the player was in at the last update
+        self.focus_x = WIDTH // 2  # Player position at the last update
+        self.focus_y = HEIGHT // 2
+        self.obstacles = []  # pygame.Rects ground enemies path around (no map places any yet)
+        self.obstacle_version = 0  # Bumped on every change, so flow fields know to rebuild
+
+    def reset(self, endless=False):
+        """Start a new run in arena or endless mode."""
+        self.endless = endless
+        self.chunks = {}
+        self.center_chunk = None
+        self.focus_x = WIDTH // 2
+        self.focus_y = HEIGHT // 2
+        self.set_obstacles([])
+
+    def set_obstacles(self, rects):
+        """Replace the obstacles (map-coordinate rects) enemies walk around."""
+        self.obstacles = [pygame.Rect(rect) for rect in rects]
+        self.obstacle_version += 1
+
+    def update(self, player, enemy_manager):
+        """Follow the player, streaming chunks in and out in endless mode."""
+        self.focus_x, self.focus_y = player.x, player.y
+        if not self.endless:
+            return
+        center = (int(player.x // CHUNK_SIZE), int(player.y // CHUNK_SIZE))
+        if center == self.center_chunk:
+            return
+        self.center_chunk = center
+
+        center_x, center_y = center
+        for chunk_x in range(center_x - LOAD_RADIUS, center_x + LOAD_RADIUS + 1):
+            for chunk_y in range(center_y - LOAD_RADIUS, center_y + LOAD_RADIUS + 1):
+                if (chunk_x, chunk_y) not in self.chunks:
+                    self.chunks[(chunk_x, chunk_y)] = Chunk(chunk_x, chunk_y, self.background)
+
+        evicted = [key for key in self.chunks
+                   if max(abs(key[0] - center_x), abs(key[1] - center_y)) > EVICT_RADIUS]
+        if evicted:
+            for key in evicted:
+                del self.chunks[key]
+            self.drop_far_entities(enemy_manager)
+
+    def drop_far_entities(self, enemy_manager):
+        """Remove XP drops and ordinary enemies more than EVICT_RADIUS chunks from the player."""
+        center_x, center_y = self.center_chunk
+        for index in range(len(xp_drops) - 1, -1, -1):  # Backwards, so swap-removes only move visited drops
+            xp = xp_drops[index]
+            if max(abs(xp.x // CHUNK_SIZE - center_x), abs(xp.y // CHUNK_SIZE - center_y)) > EVICT_RADIUS:
+                remove_xp_drop(index)
+
+        store = enemy_manager.store
+        n = store.count
+        far = np.maximum(np.abs(np.floor_divide(store.x[:n], CHUNK_SIZE) - center_x),
+                         np.abs(np.floor_divide(store.y[:n], CHUNK_SIZE) - center_y)) > EVICT_RADIUS
+        enemy_manager.director.despawn(enemy_manager, far)
+
+    def clamp_player(self, x, y, size):
+        """Keep the player's top-left corner inside the map."""
+        if self.endless:
+            return x, y
+        return max(0, min(MAP_WIDTH - size, x)), max(0, min(MAP_HEIGHT - size, y))
+
+    def inside(self, xs, ys):
+        """Boolean mask of the points (arrays) inside the map, or the playable area in endless mode."""
+        left, top, right, bottom = self.playable_area()
+        return (xs >= left) & (xs <= right) & (ys >= top) & (ys <= bottom)
+
+    def playable_area(self):
+        """(left, top, right, bottom) of the area bosses keep inside."""
+        if self.endless:
+            center_x, center_y = self.center_chunk
+            return ((center_x - LOAD_RADIUS) * CHUNK_SIZE, (center_y - LOAD_RADIUS) * CHUNK_SIZE,
+                    (center_x + LOAD_RADIUS + 1) * CHUNK_SIZE, (center_y + LOAD_RADIUS + 1) * CHUNK_SIZE)
+        return (0, 0, MAP_WIDTH, MAP_HEIGHT)
+
+    def boss_spawn_point(self):
+        """Where bosses appear: the map center, or one screen above the player in endless mode."""
+        if self.endless:
+            return int(self.focus_x), int(self.focus_y - pygame.display.get_surface().get_height())
+        return MAP_WIDTH // 2, MAP_HEIGHT // 2
+
+    def camera_offset(self, player_x, player_y, screen_width, screen_height):
+        """Top-left of the view centered on the player, kept inside the map in arena mode."""
+        offset_x = player_x - screen_width // 2
+        offset_y = player_y - screen_height // 2
+        if self.endless:
+            return offset_x, offset_y
+        return (max(0, min(offset_x, MAP_WIDTH - screen_width)),
+                max(0, min(offset_y, MAP_HEIGHT - screen_height)))
+
+    def draw_background(self, screen, camera_x, camera_y):
+        """Draw the ground under the camera."""
+        if not self.endless:
+            self.background.draw(screen, camera_x, camera_y)
+            return
+
+        size = self.background.tile_size
+        camera_x, camera_y = int(camera_x), int(camera_y)  # Whole pixels, so neighbouring tiles line up
+        screen_width, screen_height = screen.get_size()
+        blits = []
+        for row in range(camera_y // size, (camera_y + screen_height - 1) // size + 1):
+            for column in range(camera_x // size, (camera_x + screen_width - 1) // size + 1):
+                chunk = self.chunks.get((column // CHUNK_TILES, row // CHUNK_TILES))
+                if chunk is not None:
+                    tile = chunk.tiles[row % CHUNK_TILES][column % CHUNK_TILES]
+                    blits.append((tile, (column * size - camera_x, row * size - camera_y)))
+        screen.blits(blits, doreturn=False)
+
+# Shared world; reset_game() chooses the mode of every run (WORLD_MODE in settings.py)
+world = World()
@@ -1,12 +1,28 @@
 import pygame
 from settings import *
+from pool import Pool, swap_remove
+
+class XpDrop:
+    """XP left behind by a defeated enemy. Instances are recycled through xp_pool."""
+    __slots__ = ('x', 'y', 'value')
 
 # XP properties
 xp_width = 10  # Width of the XP
 xp_height = 14  # Height of the XP
 xp_drops = []  # List to store XP drops
+xp_pool = Pool(XpDrop)
 player_xp = 0  # Initial XP
 
+def new_xp_drop(x, y, value):
+    """Take an XP drop worth `value` at (x, y) from the pool."""
+    xp = xp_pool.acquire()
+    xp.x, xp.y, xp.value = x, y, value
+    return xp
+
+def remove_xp_drop(index):
+    """Swap-remove the XP drop at `index` and return it to the pool."""
+    xp_pool.release(swap_remove(xp_drops, index))
+
 # Load the XP image
 try:
     xp_image = pygame.image.load('./assets/images/xp/xp-drop.png')
@@ -15,28 +31,37 @@ except pygame.error as e:
     print(f"Error loading XP image: {e}")
     xp_image = None  # Fallback to None if loading fails
 
-def draw_xp_drops(screen, player, camera_x, camera_y):
-    """Draw and handle XP drops."""
+def collect_xp_drops(player):
+    """Give the player every XP drop they are touching."""
     player_rect = pygame.Rect(player.x, player.y, player.size, player.size)
 
-    for xp in xp_drops[:]:
-        xp_rect = pygame.Rect(xp['x'], xp['y'], xp_width, xp_height)
+    index = 0
+    while index < len(xp_drops):
+        xp = xp_drops[index]
+        xp_rect = pygame.Rect(xp.x, xp.y, xp_width, xp_height)
+
+        # Check collision with player
+        if player_rect.colliderect(xp_rect):
+            player.gain_xp(xp.value)  # Add XP based on the value of the drop
+            remove_xp_drop(index)  # The last drop moves here; check it next
+            if collect_xp_sound:
+                collect_xp_sound.play()  # Play the XP collection sound
+        else:
+            index += 1
 
+def draw_xp_drops(screen, camera_x, camera_y, view=None):
+    """Draw all XP drops, skipping those outside `view`."""
+    for xp in xp_drops:
+        if view is not None and not view.collidepoint(xp.x, xp.y):
+            continue
         # Draw XP as an image relative to the camera
         if xp_image:
-            screen.blit(xp_image, (xp['x'] - camera_x, xp['y'] - camera_y))
+            screen.blit(xp_image, (xp.x - camera_x, xp.y - camera_y))
         else:
             # Fallback to a rectangle if the image fails to load
             pygame.draw.rect(screen, GREEN, (
-                xp['x'] - camera_x,
-                xp['y'] - camera_y,
+                xp.x - camera_x,
+                xp.y - camera_y,
                 xp_width,
                 xp_height
             ))
-
-        # Check collision with player
-        if player_rect.colliderect(xp_rect):
-            player.gain_xp(xp['value'])  # Add XP based on the value of the drop
-            xp_drops.remove(xp)
-            if collect_xp_sound:
-                collect_xp_sound.play()  # Play the XP collection sound